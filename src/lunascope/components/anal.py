@@ -20,7 +20,8 @@
 #
 #  --------------------------------------------------------------------
 
-import os, sys, traceback, threading, multiprocessing, queue
+import os, re, sys, traceback, threading, multiprocessing, queue
+from pathlib import Path
 import pandas as pd
 from typing import List, Tuple
 
@@ -44,6 +45,16 @@ from PySide6.QtGui import QAction
 from ..file_dialogs import open_file_name, save_file_name
 
 
+# key, first whitespace/'=' separator run, rest-of-line value
+_PAIR_RE = re.compile(r'^\s*([^\s=]+)(?:[\s=]+(.*?))?\s*$')
+
+# whole-buffer variant: one multiline scan over the param text,
+# skipping blank and '%'-comment lines
+_PAIRS_RE = re.compile(
+    r'^[ \t]*(?!%)([^\s=]+)[ \t=]+(.*?)[ \t\r]*$',
+    re.MULTILINE,
+)
+
 _PROJECT_EVAL_WORKERS_KEY = "analysis/project_eval_workers"
 _PROJECT_EVAL_CHILD_PROJ = None
 _OUTPUT_TABLE_AUTOSORT_CELL_LIMIT = 250_000
@@ -128,14 +139,13 @@ def _project_eval_run_record(proj, record):
         results = {}
         if tbls is not None:
             tree_tbls = tbls[["Command", "Strata"]].copy()
-            for row in tbls.itertuples(index=False):
-                key = f"{row.Command}_{row.Strata}"
+            for cmd, strata in tree_tbls.itertuples(index=False, name=None):
                 df = _normalize_project_result_table(
-                    p.table(row.Command, row.Strata),
+                    p.table(cmd, strata),
                     id_str,
                 )
                 if df is not None:
-                    results[key] = df
+                    results[f"{cmd}_{strata}"] = df
 
         try:
             p.silent_proc("REPORT show-all")
@@ -288,9 +298,18 @@ class AnalMixin:
         tv.setModel(m)
         tv.setUniformRowHeights(True)
         tv.header().setStretchLastSection(True)
+        # let Qt size tree columns lazily rather than walking every row
+        # with explicit resizeColumnToContents() on each rebuild
+        tv.header().setSectionResizeMode(QHeaderView.ResizeToContents)
 
         # store info on selecting rows of destrat
         self._tree_sel = None
+
+        # memoized output-table models keyed by (cmd, stratum, transposed)
+        # and prepared base frames keyed by (cmd, stratum); both
+        # invalidated whenever self.results is replaced
+        self._anal_model_cache = {}
+        self._anal_tbl_cache = {}
         self.ui.anal_tables.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.ui.anal_tables.setSelectionMode(QAbstractItemView.SingleSelection)
 
@@ -309,8 +328,13 @@ class AnalMixin:
         view.addAction(tsv_action)
 
         view.setContextMenuPolicy(Qt.ActionsContextMenu)
-   
-        
+
+        # single proxy handles both numeric sort and comma filter; wired
+        # once here, _update_table only swaps the source model underneath
+        self.anal_table_proxy = NumericSortFilterProxy(self)
+        view.setModel(self.anal_table_proxy)
+        attach_comma_filter(view, self.ui.flt_table, proxy=self.anal_table_proxy)
+
         # whether single-sample or whole-project mode
         self.project_mode = False
         self._project_results_mode = False
@@ -343,6 +367,26 @@ class AnalMixin:
             btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
             layout.setStretch(i, 1)
 
+        # widgets toggled together by _buttons() on each exec/done
+        self._lockable_buttons = tuple(
+            b for b in (
+                self.ui.butt_anal_exec,
+                getattr(self.ui, "butt_anal_refresh_exec", None),
+                self.ui.butt_spectrogram,
+                self.ui.butt_hjorth,
+                self.ui.butt_render,
+                self.ui.butt_refresh,
+                self.ui.butt_load_slist,
+                self.ui.butt_build_slist,
+                self.ui.butt_load_edf,
+            ) if b is not None
+        )
+        self._stage_tool_buttons = (
+            self.ui.butt_calc_hypnostats,
+            self.ui.butt_soap,
+            self.ui.butt_pops,
+        )
+
 
     def _project_eval_config_dialog(self, total_records):
         total_records = max(1, int(total_records))
@@ -582,28 +626,25 @@ class AnalMixin:
                 self._proj_n = 0
 
     def _buttons( self, status ):
+        # the buttons are spread across several docks, so there is no
+        # container to batch repaints under; toggling them directly only
+        # dirties the dozen widgets that actually change
         stage_tools_enabled = status and not getattr(self, 'multiday_mode', False)
-        self.ui.butt_anal_exec.setEnabled(status)
-        if hasattr(self.ui, "butt_anal_refresh_exec"):
-            self.ui.butt_anal_refresh_exec.setEnabled(status)
-        self.ui.butt_spectrogram.setEnabled(status)
-        self.ui.butt_hjorth.setEnabled(status)
-        self.ui.butt_calc_hypnostats.setEnabled(stage_tools_enabled)
-        self.ui.butt_soap.setEnabled(stage_tools_enabled)
-        self.ui.butt_pops.setEnabled(stage_tools_enabled)
-        self.ui.butt_render.setEnabled(status)
-        self.ui.butt_refresh.setEnabled(status)
-        self.ui.butt_load_slist.setEnabled(status)
-        self.ui.butt_build_slist.setEnabled(status)
-        self.ui.butt_load_edf.setEnabled(status)
+        for b in self._lockable_buttons:
+            b.setEnabled(status)
+        for b in self._stage_tool_buttons:
+            b.setEnabled(stage_tools_enabled)
 
             
     def _render_tables(self, tbls):
 
-        # did we add any annotations? if so, updating ssa needed 
-        # (as this is where events table pulls from)
-        annots = [x for x in self.p.edf.annots() if x != "SleepStage" ]
-        self.ssa.populate( chs = [ ] , anns = annots )
+        # did we add any annotations? if so, updating ssa needed
+        # (as this is where events table pulls from); skip the populate
+        # when the annotation set is unchanged since the last run
+        annots = tuple(x for x in self.p.edf.annots() if x != "SleepStage")
+        if getattr(self, "_last_ssa_annots", None) != annots:
+            self.ssa.populate( chs = [ ] , anns = list(annots) )
+            self._last_ssa_annots = annots
 
         # some commands don't return output
         if tbls is not None:
@@ -614,10 +655,13 @@ class AnalMixin:
 
             # save, i.e. as internal results will be overwritten
             # by the HEADERS command run implicit in the updates below
+            self._clear_anal_model_cache()
             self.results = dict()
-            for row in tbls.itertuples(index=True):
-                v = "_".join( [ row.Command , row.Strata ] )
-                self.results[ v ] = self.p.table( row.Command, row.Strata )
+            cmds = tbls["Command"].tolist()
+            strats = tbls["Strata"].tolist()
+            keys = (tbls["Command"] + "_" + tbls["Strata"]).tolist()
+            for key, cmd, strata in zip(keys, cmds, strats):
+                self.results[ key ] = self.p.table( cmd, strata )
             self.sig_results_changed.emit()
 
         # we're now finished w/ the internal Luna tables: run this command
@@ -653,36 +697,38 @@ class AnalMixin:
         if tbls is None:
             return
 
-        # 1) Accumulate only Command/Strata for the tree
-        #    (no ID / Observation in this DF)
-        if not hasattr(self, "_proj_tbls"):
-            self._proj_tbls = []
-        self._proj_tbls.append(tbls[["Command", "Strata"]].copy())
-
-        # 2) Aggregate tables by Command/Strata key
-        if not hasattr(self, "_proj_results"):
-            self._proj_results = {}
-
-        for row in tbls.itertuples(index=False):
-            key = f"{row.Command}_{row.Strata}"
+        # 1) Accumulate only unique (Command, Strata) pairs for the tree
+        #    (no ID / Observation here) -- a set avoids the per-record
+        #    DataFrame copy and the final concat+drop_duplicates pass
+        if not hasattr(self, "_proj_strata_set"):
+            self._proj_strata_set = set()
+
+        # 2) Aggregate tables by Command/Strata key; keep per-record parts
+        #    in lists so any final consumer can concat once --
+        #    concatenating on every record recopies the whole accumulated
+        #    frame each time (quadratic in total bytes for many records)
+        if not hasattr(self, "_proj_results_lists"):
+            self._proj_results_lists = {}
+
+        record_id = getattr(self.p, "id", None)
+        cmds = tbls["Command"].tolist()
+        strats = tbls["Strata"].tolist()
+        keys = (tbls["Command"] + "_" + tbls["Strata"]).tolist()
+        for key, cmd, strata in zip(keys, cmds, strats):
+            self._proj_strata_set.add((cmd, strata))
             df = self._normalize_project_result_table(
-                self.p.table(row.Command, row.Strata),
-                getattr(self.p, "id", None),
+                self.p.table(cmd, strata),
+                record_id,
             )
 
-            if key in self._proj_results:
-                self._proj_results[key] = pd.concat(
-                    [self._proj_results[key], df],
-                    ignore_index=True,
-                )
-            else:
-                self._proj_results[key] = df
+            if df is not None and not df.empty:
+                self._proj_results_lists.setdefault(key, []).append(df)
 
-        # Keep the REPORT state sane per record if needed
-        try:
-            self.p.silent_proc("REPORT show-all")
-        except RuntimeError:
-            pass
+    def _clear_anal_model_cache(self):
+        for model, _, _ in self._anal_model_cache.values():
+            model.deleteLater()
+        self._anal_model_cache = {}
+        self._anal_tbl_cache = {}
 
     def _normalize_project_result_table(self, df, record_id):
         return _normalize_project_result_table(df, record_id)
@@ -707,7 +753,7 @@ class AnalMixin:
         )
         if txt_file:
             try:
-                text = open(txt_file, "r", encoding="utf-8").read()
+                text = Path(txt_file).read_text(encoding="utf-8")
                 self.ui.txt_inp.setPlainText(text)
             except (UnicodeDecodeError, OSError) as e:
                 QMessageBox.critical(
@@ -743,40 +789,55 @@ class AnalMixin:
     # handle output tables
                 
     def _update_table(self, cmd , stratum ):
-        
-        tbl = self.results[ "_".join( [ cmd , stratum ] ) ]
 
-        if not self.project_mode and not self._project_results_mode:
-            tbl = tbl.drop(columns=["ID"])
+        transposed = self.ui.radio_transpose.isChecked()
+        cache_key = (cmd, stratum, transposed)
+        cached = self._anal_model_cache.get(cache_key)
 
-        # transpose?
-        if self.ui.radio_transpose.isChecked():
-            # first coerce, otherwise this step will be missed by df_to_model()
-            tbl = self.coerce_numeric_df( tbl )
-            tbl = tbl.T.reset_index()
-            tbl.rename(columns={"index": "VAR"}, inplace=True)
-            tbl.columns = ["VAR"] + [f"row{i}" for i in range(1, tbl.shape[1])]
+        if cached is not None:
+            self.anal_model, cell_count, id_sort_col = cached
+        else:
+            # base (ID-handled) frame is shared between the normal and
+            # transposed model builds, so toggling transpose does not
+            # redo the column drop
+            tbl = self._anal_tbl_cache.get((cmd, stratum))
+            if tbl is None:
+                tbl = self.results[ "_".join( [ cmd , stratum ] ) ]
+
+                if not self.project_mode and not self._project_results_mode:
+                    tbl = tbl.loc[:, tbl.columns != "ID"]
+                self._anal_tbl_cache[(cmd, stratum)] = tbl
+
+            # transpose?
+            if transposed:
+                # first coerce, otherwise this step will be missed by df_to_model()
+                tbl = self.coerce_numeric_df( tbl )
+                tbl = tbl.T.reset_index()
+                tbl.rename(columns={"index": "VAR"}, inplace=True)
+                tbl.columns = ["VAR"] + [f"row{i}" for i in range(1, tbl.shape[1])]
+
+            cell_count = len(tbl) * max(1, len(tbl.columns))
+
+            self.anal_model = self.df_to_model(
+                tbl,
+                coerce_numeric=False,
+                build_row_text=False,
+            )
+            self.anal_model.setParent(self)
+            id_sort_col = (
+                list(tbl.columns).index("ID") if "ID" in tbl.columns else None
+            )
+            self._anal_model_cache[cache_key] = (
+                self.anal_model, cell_count, id_sort_col,
+            )
 
-        cell_count = len(tbl) * max(1, len(tbl.columns))
         is_large_output = cell_count > _OUTPUT_TABLE_AUTORESIZE_CELL_LIMIT
-        
-        self.anal_model = self.df_to_model(
-            tbl,
-            coerce_numeric=False,
-            build_row_text=False,
-        )
-
-        # single proxy handles both numeric sort and comma filter
-        self.anal_table_proxy = NumericSortFilterProxy(self)
-        self.anal_table_proxy.setSourceModel( self.anal_model )
 
         view = self.ui.anal_table
         view.setSortingEnabled(False)
-        view.setModel(self.anal_table_proxy)
-
-        # pass existing proxy so attach_comma_filter wires the filter without wrapping again
         self.ui.flt_table.clear()
-        self.events_table_proxy = attach_comma_filter( self.ui.anal_table , self.ui.flt_table , proxy=self.anal_table_proxy )
+        if self.anal_table_proxy.sourceModel() is not self.anal_model:
+            self.anal_table_proxy.setSourceModel( self.anal_model )
 
         h = view.horizontalHeader()
         h.setSectionResizeMode(QHeaderView.Interactive)  # user-resizable
@@ -788,65 +849,90 @@ class AnalMixin:
             h.setResizeContentsPrecision(50)             # sample first 50 rows only
             view.resizeColumnsToContents()
         if (
-            "ID" in tbl.columns
+            id_sort_col is not None
             and cell_count <= _OUTPUT_TABLE_AUTOSORT_CELL_LIMIT
         ):
             try:
-                id_col = list(tbl.columns).index("ID")
                 view.setSortingEnabled(True)
-                view.sortByColumn(id_col, Qt.AscendingOrder)
+                view.sortByColumn(id_sort_col, Qt.AscendingOrder)
             except Exception:
                 view.setSortingEnabled(False)
         else:
             view.setSortingEnabled(False)
 
         
-    def _on_anal_filter_text(self, text: str):
-        rx = QRegularExpression(QRegularExpression.escape(text))
-        rx.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
-        self.anal_table_proxy.setFilterRegularExpression(rx)
-        
-
-
-    
     # ------------------------------------------------------------
     # tree helpers
 
     def set_tree_from_df(self, df):
-        m = QStandardItemModel(self)
-        m.setHorizontalHeaderLabels(["Key", "Values"])
-        root = m.invisibleRootItem()
-
         # Empty or None: just show headers
         if df is None or getattr(df, "empty", True):
-            self.ui.anal_tables.setModel(m)
-            self._anal_model = m
-            self._wire_tree_selection()
-            self.ui.anal_tables.resizeColumnToContents(0)
-            self.ui.anal_tables.resizeColumnToContents(1)
+            self._install_tree_model([])
             return
 
-        # Ensure we have up to two columns
+        # do the pandas/string normalization off the UI thread; only the
+        # QStandardItem construction has to happen on the main thread
+        fut = self._exec.submit(self._build_tree_rows, df)
+
+        def _done(_f=fut):
+            try:
+                rows = _f.result()
+            except Exception:
+                rows = []
+            self._pending_tree_rows = rows
+            QMetaObject.invokeMethod(
+                self, "_install_pending_tree_model", Qt.QueuedConnection
+            )
+
+        fut.add_done_callback(_done)
+
+    @staticmethod
+    def _build_tree_rows(df):
+        # pure data; safe to run on a worker thread
         sub = df.iloc[:, :2].copy()
         if sub.shape[1] == 1:
             sub.insert(1, "_val", "")
 
-        # Build rows
-        keys = sub.iloc[:, 0].astype(str)
-        vals = sub.iloc[:, 1]
+        keys_list = sub.iloc[:, 0].astype(str).tolist()
+        v = sub.iloc[:, 1]
+        raw_list = (
+            v.where(v.notna(), "")
+            .astype(str)
+            .str.strip("_")
+            .str.replace(r"_+", "_", regex=True)
+            .tolist()
+        )
+        vals_list = [s.replace("_", ", ") for s in raw_list]
+        return list(zip(keys_list, vals_list, raw_list))
+
+    @Slot()
+    def _install_pending_tree_model(self):
+        # None marks an already-consumed slot: when two builds overlap, the
+        # first queued invoke installs the newest rows and the second must
+        # not follow up with an empty tree
+        rows = getattr(self, "_pending_tree_rows", None)
+        if rows is None:
+            return
+        self._pending_tree_rows = None
+        self._install_tree_model(rows)
+
+    def _install_tree_model(self, rows):
+        m = QStandardItemModel(self)
+        m.setHorizontalHeaderLabels(["Key", "Values"])
+        root = m.invisibleRootItem()
 
-        for key, val in zip(keys, vals):
-            parts = [] if pd.isna(val) else [p for p in str(val).split("_") if p]
-            root.appendRow([
-                QStandardItem(key),
-                QStandardItem(", ".join(parts))
-            ])
+        QSI = QStandardItem
+        appendRow = root.appendRow
+        for key, val, raw in rows:
+            item_val = QSI(val)
+            # keep the underscore-joined strata on the item so selection
+            # handlers need not undo the display formatting
+            item_val.setData(raw, Qt.UserRole)
+            appendRow([QSI(key), item_val])
 
         self.ui.anal_tables.setModel(m)
         self._anal_model = m
         self._wire_tree_selection()
-        self.ui.anal_tables.resizeColumnToContents(0)
-        self.ui.anal_tables.resizeColumnToContents(1)
 
            
     def _wire_tree_selection(self):
@@ -873,15 +959,17 @@ class AnalMixin:
             return None
         r = ix.row()
         key  = ix.sibling(r, 0).data()
-        vals = ix.sibling(r, 1).data()
+        vals = ix.sibling(r, 1).data(Qt.UserRole)
+        if vals is None:
+            vals = (ix.sibling(r, 1).data() or "").replace(", ", "_")
         return key, vals
-        
+
     def _on_tree_sel(self, selected, _):
         kv = self._current_key_vals()
         if not kv:
             return
         key, vals = kv
-        self._update_table(key, vals.replace(", ", "_"))
+        self._update_table(key, vals)
 
     def _on_radio_transpose_changed(self, checked):
         # call on any toggle, or guard if you only care about checked=True
@@ -889,7 +977,7 @@ class AnalMixin:
         if not kv:
             return
         key, vals = kv
-        self._update_table(key, vals.replace(", ", "_"))
+        self._update_table(key, vals)
 
 
     # ------------------------------------------------------------
@@ -897,7 +985,16 @@ class AnalMixin:
     
 
     def _tokenize_pair_line(self, line: str, keep_quotes: bool = True) -> list[str]:
-        out, buf, q, esc = [], [], None, False
+        # fast path: no quoting/escaping, so one C-level regex match
+        # replaces the per-character state machine below
+        if '"' not in line and "'" not in line and '\\' not in line:
+            m = _PAIR_RE.match(line)
+            if not m:
+                return []
+            key, val = m.group(1), m.group(2)
+            return [key] if val is None else [key, val]
+
+        out, buf, q, esc, eq_seen = [], [], None, False, False
         for ch in line:
             if esc:
                 buf.append(ch); esc = False; continue
@@ -909,12 +1006,18 @@ class AnalMixin:
             if ch in ('"', "'"):
                 q = ch; buf.append(ch); continue
             if ch in (' ', '\t', '=') and not out:
+                if ch == '=':
+                    eq_seen = True
                 out.append(''.join(buf).strip())
                 buf = []  # start capturing right side fresh
                 continue
             buf.append(ch)
         if buf:
             out.append(''.join(buf).strip())
+        elif len(out) == 1 and eq_seen:
+            # bare "key=": agree with the regex fast paths, which yield an
+            # empty value rather than dropping the pair
+            out.append('')
         # remove leading = or whitespace on right side
         if len(out) == 2:
             out[1] = out[1].lstrip('= \t')
@@ -926,8 +1029,15 @@ class AnalMixin:
 
 
     def _parse_tab_pairs(self, edit: QPlainTextEdit) -> List[Tuple[str, str]]:
+        text = edit.toPlainText()
+
+        # fast path: no quoting/escaping anywhere, so extract every pair
+        # with one C-level multiline scan instead of a per-line loop
+        if '"' not in text and "'" not in text and '\\' not in text:
+            return [m.group(1, 2) for m in _PAIRS_RE.finditer(text)]
+
         pairs: List[Tuple[str, str]] = []
-        for raw in edit.toPlainText().splitlines():
+        for raw in text.splitlines():
             line = raw.strip()
             if not line or line.startswith('%'):
                 continue
@@ -983,6 +1093,8 @@ class AnalMixin:
 
         self.project_mode = True
         self._project_results_mode = False
+        self._proj_results_lists = {}
+        self._proj_strata_set = set()
         self._proj_cancel_event.clear()
         self._proj_cancel_requested = False
 
@@ -1231,6 +1343,7 @@ class AnalMixin:
     def _proj_eval_done_ok(self, payload):
         try:
             tbls = payload.get("tbls")
+            self._clear_anal_model_cache()
             self.results = payload.get("results", {})
             self._project_results_mode = True
             if tbls is not None:
@@ -20,6 +20,7 @@
 #
 #  --------------------------------------------------------------------
 
+import copy
 import re
 from pathlib import Path
 from PySide6.QtWidgets import QMessageBox
@@ -55,6 +56,78 @@ import pyqtgraph as pg
 from  ..helpers import random_darkbg_colors
 
 
+# boolean [par] tokens (case-insensitive on the single-letter forms)
+_TRUE_TOKENS = frozenset(("Y", "T", "1", "y", "t"))
+
+
+def _istrue(s: str) -> bool:
+    return s in _TRUE_TOKENS
+
+
+# [par] dock-visibility key -> ui dock attribute
+_DOCK_KEYS = (
+    ("project-dock", "dock_slist"),
+    ("settings-dock", "dock_settings"),
+    ("console-dock", "dock_console"),
+    ("hypnogram-dock", "dock_hypno"),
+    ("spectrogram-dock", "dock_spectrogram"),
+    ("mask-dock", "dock_mask"),
+    ("signal-dock", "dock_sig"),
+    ("annots-dock", "dock_annot"),
+    ("instance-dock", "dock_annots"),
+    ("outputs-dock", "dock_outputs"),
+)
+
+
+def _par_line_weight(self, v):
+    self.cfg_line_weight = float(v)
+    if getattr(self, "_line_weight_spin", None) is not None:
+        b = QSignalBlocker(self._line_weight_spin)
+        self._line_weight_spin.setValue(self.cfg_line_weight)
+        del b
+
+
+def _par_pops_path(self, v):
+    self.cfg_pops_path = v
+    if hasattr(self, "_set_pops_path"):
+        self._set_pops_path(v)
+    else:
+        self.ui.txt_pops_path.setText(v)
+
+
+def _par_pops_model(self, v):
+    self.cfg_pops_model = v
+    self.ui.txt_pops_model.setText(v)
+
+
+def _par_day_anchor(self, v):
+    try:
+        iv = int(v)
+    except (ValueError, TypeError):
+        return
+    if 0 <= iv <= 23:
+        self.cfg_day_anchor = iv
+
+
+# [par] key -> handler(self, value); only keys present in a config do work
+_PAR_HANDLERS = {
+    "line-weight": _par_line_weight,
+    "show-lines": lambda self, v: setattr(self, "cfg_show_zero_line", _istrue(v)),
+    "pp-style": lambda self, v: setattr(self, "cfg_pp_style", _istrue(v)),
+    "table-allow-empty": lambda self, v: setattr(self, "cmap_use_na_for_empty", not _istrue(v)),
+    "na-token": lambda self, v: setattr(self, "cmap_na_token", v),
+    "pops-path": _par_pops_path,
+    "pops-model": _par_pops_model,
+    "pops-coda": lambda self, v: setattr(self, "cfg_pops_coda", _istrue(v)),
+    "day-anchor": _par_day_anchor,
+}
+for _key, _attr in _DOCK_KEYS:
+    _PAR_HANDLERS[_key] = (
+        lambda self, v, _attr=_attr: getattr(self.ui, _attr).setVisible(_istrue(v))
+    )
+del _key, _attr
+
+
 def _checked_names_from_view(view, header_candidates):
     checked_fn = getattr(view, "checked", None)
     if callable(checked_fn):
@@ -240,20 +313,22 @@ class CMapsMixin:
         # reset priors
         self._clear_cmaps()
         
-        # helpers
-        def ucfirst(s: str) -> str:
-            return s[:1].upper() + s[1:]
-
-        def istrue(s: str) -> bool:
-            return ucfirst(s) in [ 'Y', 'T', '1' ]
-
-        # take current text in        
+        # take current text in; skip the re-parse when the text is unchanged
+        # since the last apply (the cache survives _clear_cmaps on purpose)
         text = self.ui.txt_cmap.toPlainText()
-        try:
-            self.cfg = parse_cmap(text)
-        except ValueError as e:
-            QMessageBox.critical(self.ui, "CMap parse error", str(e))
-            return False
+        h = hash(text)
+        if h == getattr(self, "_cmap_text_hash", None) and self._cmap_cached_cfg is not None:
+            # hand out a copy: the app mutates self.cfg in place (e.g.
+            # line-weight / show-lines), which must not leak into the cache
+            self.cfg = copy.deepcopy(self._cmap_cached_cfg)
+        else:
+            try:
+                self.cfg = parse_cmap(text)
+            except ValueError as e:
+                QMessageBox.critical(self.ui, "CMap parse error", str(e))
+                return False
+            self._cmap_text_hash = h
+            self._cmap_cached_cfg = copy.deepcopy(self.cfg)
 
         # load sigmod palettes: builtins + any [pal] sections from cfg
         self.sigmod_colors[ 'rwb'        ] = self.rwb_sigmod_colors
@@ -278,155 +353,55 @@ class CMapsMixin:
         # set various cfg vars
         #
 
+        par = self.cfg['par']
+        sig = self.cfg['sig']
+
         self.cfg_line_weight = 1;
 
         self.cfg_show_zero_line = True;
         self.cfg_pp_style = True
 
-        if 'line-weight' in self.cfg['par']:
-            self.cfg_line_weight = float( self.cfg['par']['line-weight'] )
-            if getattr(self, "_line_weight_spin", None) is not None:
-                b = QSignalBlocker(self._line_weight_spin)
-                self._line_weight_spin.setValue(self.cfg_line_weight)
-                del b
-            
-        if 'show-lines' in self.cfg['par']:
-            t = self.cfg['par']['show-lines']            
-            if t == "1" or t == "Y" or t == "T":
-                self.cfg_show_zero_line = True
-            else:
-                self.cfg_show_zero_line = False
-
-        if 'pp-style' in self.cfg['par']:
-            t = self.cfg['par']['pp-style']
-            if t == "1" or t == "Y" or t == "T":
-                self.cfg_pp_style = True
-            else:
-                self.cfg_pp_style = False
-
-        # copy/save tbls: treatment of empty values
-        if 'table-allow-empty' in self.cfg['par']:
-            self.cmap_use_na_for_empty = not istrue( self.cfg['par']['table-allow-empty'] )
-                       
-        if 'na-token' in self.cfg['par']:
-            self.cmap_na_token = self.cfg['par']['na-token']                       
-            
-        # POPS
-
-        if 'pops-path' in self.cfg['par']:
-            self.cfg_pops_path = self.cfg['par']['pops-path']
-            if hasattr(self, "_set_pops_path"):
-                self._set_pops_path(self.cfg_pops_path)
-            else:
-                self.ui.txt_pops_path.setText(self.cfg_pops_path)
-	    
-        if 'pops-model' in self.cfg['par']:
-            self.cfg_pops_model = self.cfg['par']['pops-model']
-            self.ui.txt_pops_model.setText( self.cfg_pops_model )
-            
-        if 'pops-coda' in self.cfg['par']:
-            t = self.cfg['par']['pops-coda']
-            if t == "1" or t == "Y" or t == "T":
-                self.cfg_pops_coda = True
-            else:
-                self.cfg_pops_coda = False
-
-        # ACTIG
-            
-        if 'day-anchor' in self.cfg['par']:
-            try:
-                v = int(self.cfg['par']['day-anchor'])
-                if 0 <= v <= 23:
-                    self.cfg_day_anchor = v
-            except (ValueError, TypeError):
-                pass
-
-                        
-        # dock viz
-        if 'project-dock' in self.cfg['par']:
-            t = self.cfg['par']['project-dock']
-            self.ui.dock_slist.setVisible( istrue(t) )
-                
-        if 'settings-dock' in self.cfg['par']:
-            t = self.cfg['par']['settings-dock']
-            self.ui.dock_settings.setVisible( istrue(t) )
-
-        if 'console-dock' in self.cfg['par']:
-            t = self.cfg['par']['console-dock']
-            self.ui.dock_console.setVisible( istrue(t) )
-
-        if 'hypnogram-dock' in self.cfg['par']:
-            t = self.cfg['par']['hypnogram-dock']
-            self.ui.dock_hypno.setVisible( istrue(t) )
-        
-        if 'spectrogram-dock' in self.cfg['par']:
-            t = self.cfg['par']['spectrogram-dock']
-            self.ui.dock_spectrogram.setVisible( istrue(t) )
-                
-        if 'mask-dock' in self.cfg['par']:
-            t = self.cfg['par']['mask-dock']
-            self.ui.dock_mask.setVisible( istrue(t) )
-
-        if 'signal-dock' in self.cfg['par']:
-            t = self.cfg['par']['signal-dock']
-            self.ui.dock_sig.setVisible( istrue(t) )
-
-        if 'annots-dock' in self.cfg['par']:
-            t = self.cfg['par']['annots-dock']
-            self.ui.dock_annot.setVisible( istrue(t) )
-
-        if 'instance-dock' in self.cfg['par']:
-            t = self.cfg['par']['instance-dock']
-            self.ui.dock_annots.setVisible( istrue(t) )
-
-        if 'outputs-dock' in self.cfg['par']:
-            t = self.cfg['par']['outputs-dock']
-            self.ui.dock_outputs.setVisible( istrue(t) )
-
-        #
-        # channel filters
-        #
-
-        for ch, ch_spec in self.cfg['sig'].items():
-            if 'f' in ch_spec:
-                fcode = ch_spec['f']
-                if fcode is not None:
-                    lwr = fcode[0]
-                    upr = fcode[1]
-                    if lwr < upr and lwr >= 0 and upr >= 0:
-                        # user-specific filter map: { ch : [ lwr , upr ] }
-                        self.user_fmap_frqs[ ch ] = [ lwr , upr ]                        
-                    else:
-                        print( 'unknown filter values:' , fcode )
+        # dispatch on the keys actually present rather than testing every
+        # possible key; handlers (incl. dock viz) live in _PAR_HANDLERS.
+        # meta-data/meta-data-vars interact and are handled below.
+        for k, v in par.items():
+            h = _PAR_HANDLERS.get(k)
+            if h is not None:
+                h(self, v)
 
         #
-        # channel ylims
+        # channel filters / ylims / y-lines (single pass over [sig])
         #
 
-        for ch, ch_spec in self.cfg['sig'].items():
-            if 'ylim' in ch_spec:
-                ycode = ch_spec['ylim']
-                if ycode is not None:
-                    lwr = ycode[0]
-                    upr = ycode[1]
-                    if lwr < upr:                        
-                        self.cmap_fixed_min[ ch ] = lwr
-                        self.cmap_fixed_max[ ch ] = upr
-                    else:
-                        print( 'unknown ylim value:' , ycode )
-
-
-        # c-map y-lines
         self.cmap_n_ylines = 0
-        for ch, ch_spec in self.cfg['sig'].items():
-            if 'y' in ch_spec:
-                ycode = ch_spec['y']
-                if ycode is not None:
-                    ycode = list( ycode ) 
-                    self.cmap_ylines[ch] = ycode
-                    n = len( ycode )
-                    self.cmap_ylines_idx[ch] = list( range( self.cmap_n_ylines , self.cmap_n_ylines + n ) ) 
-                    self.cmap_n_ylines += len( self.cmap_ylines[ch] )
+        for ch, ch_spec in sig.items():
+            fcode = ch_spec.get('f')
+            if fcode is not None:
+                lwr = fcode[0]
+                upr = fcode[1]
+                if lwr < upr and lwr >= 0 and upr >= 0:
+                    # user-specific filter map: { ch : [ lwr , upr ] }
+                    self.user_fmap_frqs[ ch ] = [ lwr , upr ]
+                else:
+                    print( 'unknown filter values:' , fcode )
+
+            ycode = ch_spec.get('ylim')
+            if ycode is not None:
+                lwr = ycode[0]
+                upr = ycode[1]
+                if lwr < upr:
+                    self.cmap_fixed_min[ ch ] = lwr
+                    self.cmap_fixed_max[ ch ] = upr
+                else:
+                    print( 'unknown ylim value:' , ycode )
+
+            ycode = ch_spec.get('y')
+            if ycode is not None:
+                ycode = list( ycode )
+                self.cmap_ylines[ch] = ycode
+                n = len( ycode )
+                self.cmap_ylines_idx[ch] = list( range( self.cmap_n_ylines , self.cmap_n_ylines + n ) )
+                self.cmap_n_ylines += n
 
         
         #
@@ -441,7 +416,7 @@ class CMapsMixin:
             # ch order
             self.cmap_list.append( ch )
             # optionaly, a color
-            col = self.cfg['sig'][ch].get('col')
+            col = sig[ch].get('col')
             if col is not None and str(col).strip() != "":
                 self.cmap[ch] = col
                 
@@ -456,7 +431,7 @@ class CMapsMixin:
 
         # reverse order (for plotting goes y 0 - 1 is bottom - top currently
         # and can't be bothered to fix
-        self.cmap_rlist = list(reversed(self.cmap_list))
+        self.cmap_rlist = self.cmap_list[::-1]
                 
         # and flag that we'll have bespoke as the default
         if len(self.cmap) != 0:
@@ -467,9 +442,9 @@ class CMapsMixin:
         # meta-data controls which file is loaded (and only fires when the path changes).
         # meta-data-vars only updates the column filter; it never clears an auto-discovered
         # or interactively loaded file.
-        if 'meta-data' in self.cfg['par']:
-            new_meta_path = str(Path(self.cfg['par']['meta-data']).expanduser()).strip()
-            new_meta_vars = [v.strip() for v in self.cfg['par'].get('meta-data-vars', '').split(',') if v.strip()]
+        if 'meta-data' in par:
+            new_meta_path = str(Path(par['meta-data']).expanduser()).strip()
+            new_meta_vars = [v.strip() for v in par.get('meta-data-vars', '').split(',') if v.strip()]
             old_path = getattr(self, '_meta_file', '')
             old_vars = getattr(self, '_meta_vars_filter', [])
             if new_meta_path != old_path or new_meta_vars != old_vars:
@@ -478,8 +453,8 @@ class CMapsMixin:
                     self._load_meta_file(new_meta_path)
                 else:
                     self._clear_meta()
-        elif 'meta-data-vars' in self.cfg['par']:
-            new_meta_vars = [v.strip() for v in self.cfg['par']['meta-data-vars'].split(',') if v.strip()]
+        elif 'meta-data-vars' in par:
+            new_meta_vars = [v.strip() for v in par['meta-data-vars'].split(',') if v.strip()]
             old_vars = getattr(self, '_meta_vars_filter', [])
             if new_meta_vars != old_vars:
                 self._meta_vars_filter = new_meta_vars
@@ -543,6 +518,9 @@ class CMapsMixin:
 
         self.cmap = {}
 
+        # QPen cache for _update_cols, keyed by (color, line weight)
+        self._pen_cache = {}
+
         self.cmap_list = [ ]
 
         self.cmap_rlist = [ ] 
@@ -720,27 +698,46 @@ class CMapsMixin:
         if self.palset == 'bespoke': self._set_bespoke_palette()
         if self.palset == 'user': self._set_user_palette()
             
+    # spectrum palettes keyed by hue count; shared across instances since
+    # pg.intColor is deterministic in (i, hues)
+    _intcolor_cache = {}
+
+    @classmethod
+    def _spectrum_colors(cls, n):
+        cols = cls._intcolor_cache.get(n)
+        if cols is None:
+            cols = cls._intcolor_cache[n] = [pg.intColor(i, hues=n) for i in range(n)]
+        return cols[:]
+
+    def _palette_targets(self):
+        # checked signal/annotation names, fetched once per palette change
+        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
+        return sigs, anns
+
+    # The _set_*_palette slots below stay zero-argument: they are connected
+    # straight to QAction.triggered, which would otherwise pass the action's
+    # checked bool into the first free parameter.
+
     def _set_spectrum_palette(self):
         self.palset = 'spectrum'
-        self.ui.pg1.setBackground('black')        
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        self.ui.pg1.setBackground('black')
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
-        self.colors = [pg.intColor(i, hues=nchan) for i in range(nchan)]
+        self.colors = self._spectrum_colors(nchan)
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
-        self.acolors = [pg.intColor(i, hues=nanns) for i in range(nanns)]
+        self.acolors = self._spectrum_colors(nanns)
         self.acolors = self._update_stage_cols( self.acolors , anns )
         self._update_cols()
-        
-    def _set_white_palette(self):        
+
+    def _set_white_palette(self):
         self.palset = 'white'
         self.ui.pg1.setBackground('#E0E0E0')
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
         self.colors = ['#101010'] * nchan
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = ['#101010'] * nanns
         self.acolors = self._update_stage_cols( self.acolors , anns )
@@ -749,37 +746,37 @@ class CMapsMixin:
     def _set_muted_palette(self):
         self.palset = 'muted'
         self.ui.pg1.setBackground('#D0C0D0')
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
         self.colors = ['#403020'] * nchan
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = ['#403020'] * nanns
         self.acolors = self._update_stage_cols( self.acolors , anns )
         self._update_cols()
 
     def _set_black_palette(self):
+        sigs, anns = self._palette_targets()
+        self._apply_black_palette(sigs, anns)
+
+    def _apply_black_palette(self, sigs, anns):
         self.palset = 'black'
         self.ui.pg1.setBackground('#101010')
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
         nchan = len(sigs)
         self.colors = ['#E0E0E0'] * nchan
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = ['#E0E0E0'] * nanns
         self.acolors = self._update_stage_cols( self.acolors , anns )
         self._update_cols()
-        
+
     def _set_random_palette(self):
         self.palset = 'random'
         self.ui.pg1.setBackground('#101010')
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
         self.colors = random_darkbg_colors( nchan )
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = random_darkbg_colors( nanns )
         self.acolors = self._update_stage_cols( self.acolors , anns )
@@ -789,11 +786,10 @@ class CMapsMixin:
         self.palset = 'user'
         self.c1, self.c2 = pick_two_colors()
         self.ui.pg1.setBackground(self.c1)
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
         self.colors = [self.c2] * nchan
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = [self.c2] * nanns
         self.acolors = self._update_stage_cols( self.acolors , anns )
@@ -804,24 +800,27 @@ class CMapsMixin:
         # assume self.c1 and self.c2 already set
         #self.c1, self.c2 = pick_two_colors()
         self.ui.pg1.setBackground(self.c1)
-        sigs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
+        sigs, anns = self._palette_targets()
         nchan = len(sigs)
         self.colors = [self.c2] * nchan
         self.colors = self._update_pp_signal_cols(self.colors, sigs)
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         nanns = len( anns )
         self.acolors = [self.c2] * nanns
         self.acolors = self._update_stage_cols( self.acolors , anns )
         self._update_cols()
-        
-    def _set_bespoke_palette(self):        
+
+    def _set_bespoke_palette(self):
+        # fetch checked names once; the black base pass reuses them
+        chs, anns = self._palette_targets()
         # back default black (i.e. for things not seen)
-        self._set_black_palette()
+        self._apply_black_palette(chs, anns)
         self.palset = 'bespoke'
-        chs = _checked_names_from_view(self.ui.tbl_desc_signals, ["CH"])
-        # re-order list
+        # re-order list (rank dicts keep the sort key O(1) per comparison)
         if self.cmap_list:
-            chs = sorted( chs, key=lambda x: (self.cmap_list.index(x) if x in self.cmap_list else len(self.cmap_list) + chs.index(x)))
+            rank = { ch:i for i,ch in enumerate(self.cmap_list) }
+            base = len(self.cmap_list)
+            chs_rank = { ch:i for i,ch in enumerate(chs) }
+            chs.sort( key=lambda x: rank.get(x, base + chs_rank[x]) )
             chs.reverse()
         else:
             chs = self._order_pp_channels( chs )
@@ -830,24 +829,29 @@ class CMapsMixin:
         self.colors = override_colors(self.colors, chs, self.cmap)
         self.colors = self._update_pp_signal_cols(self.colors, chs)
         # and annots
-        anns = _checked_names_from_view(self.ui.tbl_desc_annots, ["ANNOT", "CLASS"])
         if self.cmap_rlist:
-            anns = sorted( anns, key=lambda x: (self.cmap_list.index(x) if x in self.cmap_list else len(self.cmap_list) + anns.index(x)))
+            rank = { ch:i for i,ch in enumerate(self.cmap_list) }
+            base = len(self.cmap_list)
+            anns_rank = { a:i for i,a in enumerate(anns) }
+            anns.sort( key=lambda x: rank.get(x, base + anns_rank[x]) )
         self.acolors = override_colors(self.acolors, anns, self.cmap)
         self.acolors = self._update_stage_cols( self.acolors , anns )
         self._update_cols()
 
 
     def _update_stage_cols(self,pal,anns):
-        updated = []
+        # overwrite pal in place: callers reassign the result anyway
         explicit = getattr(self, "cmap_explicit_ann_cols", set())
-        for a_i, p_i in zip(anns, pal):
-            if a_i in explicit and a_i in self.cmap:
-                updated.append(self.cmap[a_i])
+        cmap = self.cmap
+        stg = self.stgcols_hex
+        for i, a_i in enumerate(anns):
+            if a_i in explicit and a_i in cmap:
+                pal[i] = cmap[a_i]
             else:
                 stage = self._stage_from_annot_name(a_i)
-                updated.append(self.stgcols_hex.get(stage, p_i) if stage is not None else p_i)
-        return updated
+                if stage is not None:
+                    pal[i] = stg.get(stage, pal[i])
+        return pal
 
     def _stage_from_annot_name(self, annot):
         if not isinstance(annot, str):
@@ -965,7 +969,7 @@ class CMapsMixin:
 
                 # reverse order (for plotting goes y 0 - 1 is bottom - top currently
                 # and can't be bothered to fix
-                self.cmap_rlist = list(reversed(self.cmap_list))
+                self.cmap_rlist = self.cmap_list[::-1]
                 
                 # and set them
                 self._set_bespoke_palette()
@@ -983,16 +987,25 @@ class CMapsMixin:
             if hasattr(self, "_effective_line_weight")
             else float(getattr(self, "cfg_line_weight", 1.0))
         )
+        # reuse pens across curves: same-colored curves share one QPen;
+        # key on the hex name since cols may be QColor, which is unhashable
+        pens = self._pen_cache
+        def _pen(col):
+            key = (pg.mkColor(col).name(), lw)
+            p = pens.get(key)
+            if p is None:
+                p = pens[key] = pg.mkPen(col, width=lw, cosmetic=True)
+            return p
         for c, col in zip(self.curves, self.colors):
-            c.setPen(pg.mkPen(col, width=lw, cosmetic=True))
+            c.setPen(_pen(col))
         for c, col in zip(getattr(self, "fill_curves", []), self.colors):
             qcolor = pg.mkColor(col)
             qcolor.setAlpha(48)
             c.setBrush(pg.mkBrush(qcolor))
         for c, col in zip(self.sigmod_curves, self.sigmod_curve_colors):
-            c.setPen(pg.mkPen(col, width=lw, cosmetic=True))
+            c.setPen(_pen(col))
         for c, col in zip(self.annot_curves, self.acolors):
-            c.setPen(pg.mkPen(col, width=lw, cosmetic=True))
+            c.setPen(_pen(col))
 
 
 
@@ -1002,6 +1015,110 @@ class CMapsMixin:
 # --------------------------------------------------------------------------------
 # cmap file format parser
 
+BUILTIN_PALETTES = frozenset((
+    "rwb",
+    # amplitude (linear)
+    "gray", "hot", "cool", "ember", "plasma", "thermal", "aurora", "saturation",
+    # phase / cyclic
+    "rainbow",
+    # discrete threshold
+    "w10", "w20", "r10", "r20",
+    # arbitrary
+    "flux",
+))
+
+_SECTION_HEADERS = frozenset(("[par]", "[mod]", "[pal]", "[sig]", "[ann]"))
+
+
+def _parse_pair(v, section, name, label, lineno, field):
+    vals = v.split(",")
+    if len(vals) != 2:
+        raise ValueError(
+            f"Bad {name}= in [{section}] '{label}' on line {lineno}: {field}"
+        )
+    return (float(vals[0]), float(vals[1]))
+
+
+# per-section field handlers for [mod]/[sig]/[ann] entries; each mutates
+# the entry record in place
+
+def _fld_set(key):
+    def h(rec, v, section, label, lineno, field):
+        rec[key] = v
+    return h
+
+
+def _fld_set_unique(key):
+    def h(rec, v, section, label, lineno, field):
+        if rec[key] is not None:
+            raise ValueError(
+                f"Duplicate {key} in [{section}] '{label}' on line {lineno}"
+            )
+        rec[key] = v
+    return h
+
+
+def _fld_pair(key):
+    def h(rec, v, section, label, lineno, field):
+        rec[key] = _parse_pair(v, section, key, label, lineno, field)
+    return h
+
+
+def _fld_bins(rec, v, section, label, lineno, field):
+    if v not in ("abs", "pct"):
+        raise ValueError(
+            f"bins= in [mod] '{label}' must be 'abs' or 'pct' (line {lineno})"
+        )
+    rec["bins"] = v
+
+
+def _fld_y(rec, v, section, label, lineno, field):
+    if rec["y"] is not None:
+        raise ValueError(
+            f"Duplicate y in [sig] '{label}' on line {lineno}"
+        )
+    rec["y"] = [float(x) for x in v.split(",") if x]
+
+
+def _fld_mod(rec, v, section, label, lineno, field):
+    vals = v.split(",")
+    if len(vals) != 2:
+        raise ValueError(
+            f"Bad mod= in [sig] '{label}' on line {lineno}: {field}"
+        )
+    rec["mod"] = {"mod": vals[0], "pal": vals[1]}
+
+
+_FIELD_HANDLERS = {
+    "mod": {
+        "ch": _fld_set("ch"),
+        "type": _fld_set("type"),
+        "f": _fld_pair("f"),
+        "bins": _fld_bins,
+    },
+    "sig": {
+        "col": _fld_set_unique("col"),
+        "ylim": _fld_pair("ylim"),
+        "y": _fld_y,
+        "f": _fld_pair("f"),
+        "mod": _fld_mod,
+    },
+    "ann": {
+        "col": _fld_set_unique("col"),
+    },
+}
+
+
+def _norm_eq(line: str) -> str:
+    """Normalize "key = value" to "key=value" with C-level string ops.
+
+    Equivalent to re.sub(r"\\s*=\\s*", "=", line) for pre-stripped lines,
+    without entering the regex engine per line.
+    """
+    if "=" not in line:
+        return line
+    return "=".join(p.strip() for p in line.split("="))
+
 
 
 
@@ -1035,19 +1152,7 @@ def parse_cmap(text: str):
         "ann_order": [],
     }
 
-    BUILTIN_PALETTES = {
-        "rwb",
-        # amplitude (linear)
-        "gray", "hot", "cool", "ember", "plasma", "thermal", "aurora", "saturation",
-        # phase / cyclic
-        "rainbow",
-        # discrete threshold
-        "w10", "w20", "r10", "r20",
-        # arbitrary
-        "flux",
-    }
-
-    # assume [par] at start 
+    # assume [par] at start
     current_section = 'par'
     
     # For [pal] we may span multiple lines to collect 18 colors
@@ -1078,35 +1183,6 @@ def parse_cmap(text: str):
 
         if section == "mod":
             rec = {"ch": None, "type": None, "f": None, "bins": "abs"}
-            for field in fields:
-                if field.startswith("ch="):
-                    rec["ch"] = field[3:]
-                elif field.startswith("type="):
-                    rec["type"] = field[5:]
-                elif field.startswith("f="):
-                    vals = field[2:].split(",")
-                    if len(vals) != 2:
-                        raise ValueError(
-                            f"Bad f= in [mod] '{label}' on line {lineno}: {field}"
-                        )
-                    rec["f"] = (float(vals[0]), float(vals[1]))
-                elif field.startswith("bins="):
-                    v = field[5:]
-                    if v not in ("abs", "pct"):
-                        raise ValueError(
-                            f"bins= in [mod] '{label}' must be 'abs' or 'pct' (line {lineno})"
-                        )
-                    rec["bins"] = v
-                else:
-                    raise ValueError(
-                        f"Unknown token in [mod] '{label}' on line {lineno}: {field}"
-                    )
-            if rec["ch"] is None or rec["type"] is None:
-                raise ValueError(
-                    f"[mod] '{label}' missing ch= or type= (line {lineno})"
-                )
-            cmap["mod"][label] = rec
-
         elif section == "sig":
             rec = {
                 "col": None,
@@ -1115,44 +1191,28 @@ def parse_cmap(text: str):
                 "f": None,
                 "mod": None,
             }
-            for field in fields:
-                if field.startswith("col="):
-                    if rec["col"] is not None:
-                        raise ValueError(
-                            f"Duplicate col in [sig] '{label}' on line {lineno}"
-                        )
-                    rec["col"] = field[4:]
-                elif field.startswith("ylim="):
-                    vals = field[5:].split(",")
-                    if len(vals) != 2:
-                        raise ValueError(
-                            f"Bad ylim= in [sig] '{label}' on line {lineno}: {field}"
-                        )
-                    rec["ylim"] = (float(vals[0]), float(vals[1]))
-                elif field.startswith("y="):
-                    if rec["y"] is not None:
-                        raise ValueError(
-                            f"Duplicate y in [sig] '{label}' on line {lineno}"
-                        )
-                    rec["y"] = [float(x) for x in field[2:].split(",") if x]
-                elif field.startswith("f="):
-                    vals = field[2:].split(",")
-                    if len(vals) != 2:
-                        raise ValueError(
-                            f"Bad f= in [sig] '{label}' on line {lineno}: {field}"
-                        )
-                    rec["f"] = (float(vals[0]), float(vals[1]))
-                elif field.startswith("mod="):
-                    vals = field[4:].split(",")
-                    if len(vals) != 2:
-                        raise ValueError(
-                            f"Bad mod= in [sig] '{label}' on line {lineno}: {field}"
-                        )
-                    rec["mod"] = {"mod": vals[0], "pal": vals[1]}
-                else:
-                    raise ValueError(
-                        f"Unknown token in [sig] '{label}' on line {lineno}: {field}"
-                    )
+        else:
+            rec = {"col": None}
+
+        # split each key=value token once, then dispatch on the key
+        handlers = _FIELD_HANDLERS[section]
+        for field in fields:
+            k, sep, v = field.partition("=")
+            h = handlers.get(k) if sep else None
+            if h is None:
+                raise ValueError(
+                    f"Unknown token in [{section}] '{label}' on line {lineno}: {field}"
+                )
+            h(rec, v, section, label, lineno, field)
+
+        if section == "mod":
+            if rec["ch"] is None or rec["type"] is None:
+                raise ValueError(
+                    f"[mod] '{label}' missing ch= or type= (line {lineno})"
+                )
+            cmap["mod"][label] = rec
+
+        elif section == "sig":
             labels = label.split(",")
             if any(lbl == "" for lbl in labels):
                 raise ValueError(
@@ -1168,18 +1228,6 @@ def parse_cmap(text: str):
                 cmap["sig_order"].append(sig_label)
 
         elif section == "ann":
-            rec = {"col": None}
-            for field in fields:
-                if field.startswith("col="):
-                    if rec["col"] is not None:
-                        raise ValueError(
-                            f"Duplicate col in [ann] '{label}' on line {lineno}"
-                        )
-                    rec["col"] = field[4:]
-                else:
-                    raise ValueError(
-                        f"Unknown token in [ann] '{label}' on line {lineno}: {field}"
-                    )
             cmap["ann"][label] = rec
             cmap["ann_order"].append(label)
 
@@ -1191,13 +1239,16 @@ def parse_cmap(text: str):
         pending_lineno = None
 
     for lineno, raw_line in enumerate(text.splitlines(), start=1):
-        # strip comments
-        line = raw_line.split("%", 1)[0].strip()
+        # strip comments; most lines have none, so avoid the split there
+        if "%" in raw_line:
+            line = raw_line.split("%", 1)[0].strip()
+        else:
+            line = raw_line.strip()
         if not line:
             continue
 
         # Section headers
-        if line in ("[par]", "[mod]", "[pal]", "[sig]", "[ann]"):
+        if line in _SECTION_HEADERS:
             if current_section == "pal":
                 finish_pending_palette()
             elif current_section in ("mod", "sig", "ann"):
@@ -1224,23 +1275,25 @@ def parse_cmap(text: str):
                 )
             continue
 
+        # normalize once per line; shared by the [par] branch and the
+        # mod/sig/ann tokenizer below
+        line_norm = _norm_eq(line)
+
         if current_section == "par":
-            line_norm = re.sub(r"\s*=\s*", "=", line)
-            if "=" in line_norm:
-                left, right = (p.strip() for p in line_norm.split("=", 1))
+            left, sep, right = line_norm.partition("=")
+            if sep:
                 cmap["par"][left] = right
             continue
 
         # [mod] / [sig] / [ann]: buffer entries; '...' continues the previous entry
-        is_continuation = line.startswith("...")
+        is_continuation = line_norm.startswith("...")
         if is_continuation:
-            line = line[3:].strip()
+            line_norm = line_norm[3:].strip()
             if not pending_tokens:
                 raise ValueError(
                     f"Continuation '...' on line {lineno} with no preceding entry"
                 )
 
-        line_norm = re.sub(r"\s*=\s*", "=", line)
         new_tokens = line_norm.split()
         if not new_tokens:
             continue
@@ -42,3 +42,21 @@ class MplCanvas(FigureCanvas):
     def sizeHint(self):
         w, h = self.get_width_height()
         return QSize(max(320, w), max(240, h))
+
+    def draw_idle_visible(self):
+        """draw_idle, deferred while the canvas is hidden.
+
+        Qt's agg backend rasterizes on draw_idle even for widgets the
+        user cannot see; skip that and flush the pending draw when the
+        canvas is next shown.
+        """
+        if self.isVisible():
+            self.draw_idle()
+        else:
+            self._draw_deferred = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if getattr(self, "_draw_deferred", False):
+            self._draw_deferred = False
+            self.draw_idle()
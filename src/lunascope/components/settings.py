@@ -25,6 +25,7 @@ from PySide6.QtWidgets import QVBoxLayout, QHeaderView
 from PySide6.QtWidgets import QMessageBox
 
 import pandas as pd
+from pathlib import Path
 from ..file_dialogs import open_file_name, save_file_name
 
 
@@ -56,11 +57,18 @@ class SettingsMixin:
         self.ui.butt_save_param.clicked.connect( self._save_param )
         self.ui.butt_reset_param.clicked.connect( self._reset_param )
         self.ui.tab_settings.currentChanged.connect( self._sync_settings_buttons )
+
+        # tab names never change at runtime; cache them once rather than
+        # round-tripping through tabText() on every button click
+        self._settings_tab_names = {
+            i: self.ui.tab_settings.tabText(i)
+            for i in range(self.ui.tab_settings.count())
+        }
         self._sync_settings_buttons()
 
     def _settings_tab_name(self) -> str:
         idx = self.ui.tab_settings.currentIndex()
-        return self.ui.tab_settings.tabText(idx)
+        return self._settings_tab_names.get(idx, "")
 
     def _sync_settings_buttons(self, *_args):
         name = self._settings_tab_name()
@@ -115,7 +123,7 @@ class SettingsMixin:
         
         if txt_file:
             try:
-                text = open(txt_file, "r", encoding="utf-8").read()
+                text = Path(txt_file).read_text(encoding="utf-8")
                 if is_cmap:
                     self.ui.txt_cmap.setPlainText(text)
                 else:
@@ -166,8 +174,10 @@ class SettingsMixin:
             else:
                 filename = _append_selected_extension(filename, selected_filter, (".txt", ".par"))
                 
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(new_file)
+            # encode once and write the whole buffer in a single call
+            data = new_file.encode("utf-8")
+            with open(filename, "wb") as f:
+                f.write(data)
 
 
 
@@ -194,28 +204,29 @@ class SettingsMixin:
         
         # get aliases
         aliases = self.proj.eng.aliases()
-        df = pd.DataFrame(aliases, columns=["Type", "Primary", "Secondary"])
+        df = pd.DataFrame.from_records(aliases, columns=["Type", "Primary", "Secondary"])
         model = self.df_to_model( df )
         self.ui.tbl_aliases.setModel( model )
         view = self.ui.tbl_aliases
         view.verticalHeader().setVisible(False)
-        view.resizeColumnsToContents()
         view.setSortingEnabled(False)
         h = view.horizontalHeader()
         h.setSectionResizeMode(QHeaderView.Interactive)
         h.setStretchLastSection(True)
+        # sample a bounded number of rows when measuring column widths
+        h.setResizeContentsPrecision(64)
         view.resizeColumnsToContents()
     
         # get special variables
         vars = self.proj.vars()
-        df = pd.DataFrame(list(vars.items()), columns=["Variable", "Value"])        
+        df = pd.DataFrame({"Variable": list(vars.keys()), "Value": list(vars.values())})
         model = self.df_to_model( df )
         self.ui.tbl_param.setModel( model )
         view = self.ui.tbl_param
         view.verticalHeader().setVisible(False)
-        view.resizeColumnsToContents()
         view.setSortingEnabled(False)
         h = view.horizontalHeader()
         h.setSectionResizeMode(QHeaderView.Interactive)
         h.setStretchLastSection(True)
+        h.setResizeContentsPrecision(64)
         view.resizeColumnsToContents()
@@ -179,6 +179,9 @@ class DataFrameModel(QAbstractTableModel):
         self._float_digs   = [digs.get(c, float_decimals_default) for c in cols]
         self._row_text = self._build_row_text() if build_row_text else None
         self._filter_mask = None
+        # lazily materialised object array for data(); ndarray indexing is
+        # much cheaper than DataFrame.iat per visible cell during repaints
+        self._arr = None
 
     def row_text(self) -> list[str]:
         if self._row_text is None:
@@ -238,7 +241,10 @@ class DataFrameModel(QAbstractTableModel):
             return None
         r, c = index.row(), index.column()
         if role in (Qt.DisplayRole, Qt.EditRole):
-            v = self._df.iat[r, c]
+            arr = self._arr
+            if arr is None:
+                arr = self._arr = self._df.to_numpy(dtype=object)
+            v = arr[r, c]
             try:
                 if pd.isna(v):
                     return ""
@@ -72,6 +72,10 @@ class MultiSelectComboBox(QComboBox):
         self.lineEdit().setPlaceholderText("Select one or more channels")
         self._popup_visible = False
         self._press_row = -1
+        # label cache + checked row set: checked_items() is hit on every
+        # popup close and button click, so avoid walking the Qt model
+        self._labels = []
+        self._checked_rows = set()
 
         self._popup = QFrame(None, Qt.Popup)
         self._popup.setFrameShape(QFrame.StyledPanel)
@@ -87,6 +91,11 @@ class MultiSelectComboBox(QComboBox):
         popup_layout.addWidget(self._list)
         self.lineEdit().installEventFilter(self)
 
+        # coalesce text refreshes during rapid toggling bursts
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._refresh_text)
+
     def _valid_qobject(self, obj):
         return obj is not None and isValid(obj)
 
@@ -162,37 +171,46 @@ class MultiSelectComboBox(QComboBox):
         model = self.model()
         model.clear()
         self._list.clear()
-        for lab in labels:
-            item = QStandardItem(str(lab))
+        self._labels = [str(lab) for lab in labels]
+        self._checked_rows = {r for r, lab in enumerate(self._labels) if lab in checked}
+        items = []
+        for r, lab in enumerate(self._labels):
+            item = QStandardItem(lab)
             item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
-            item.setData(Qt.Checked if lab in checked else Qt.Unchecked, Qt.CheckStateRole)
-            model.appendRow(item)
-            popup_item = QListWidgetItem(str(lab), self._list)
+            item.setData(Qt.Checked if r in self._checked_rows else Qt.Unchecked, Qt.CheckStateRole)
+            items.append(item)
+            popup_item = QListWidgetItem(lab, self._list)
             popup_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
-            popup_item.setCheckState(Qt.Checked if lab in checked else Qt.Unchecked)
+            popup_item.setCheckState(Qt.Checked if r in self._checked_rows else Qt.Unchecked)
+        # one appendRows call => one rowsInserted signal for the whole batch
+        if items:
+            model.invisibleRootItem().appendRows(items)
         self._refresh_text()
         self.selectionChanged.emit()
 
     def checked_items(self):
-        if not self._valid_qobject(getattr(self, "_list", None)):
+        # answered from the cache kept in sync by the mutators below
+        labels = getattr(self, "_labels", None)
+        if not labels:
             return []
-        out = []
-        for r in range(self._list.count()):
-            item = self._list.item(r)
-            if item and item.checkState() == Qt.Checked:
-                out.append(item.text())
-        return out
+        checked = self._checked_rows
+        return [labels[r] for r in range(len(labels)) if r in checked]
 
     def set_checked_items(self, labels):
         wanted = {str(label) for label in (labels or [])}
         if not self._valid_qobject(getattr(self, "_list", None)):
             return
+        self._checked_rows = set()
         for r in range(self._list.count()):
             item = self._list.item(r)
             model_item = self.model().item(r)
             if item is None or model_item is None:
                 continue
-            state = Qt.Checked if item.text() in wanted else Qt.Unchecked
+            if item.text() in wanted:
+                state = Qt.Checked
+                self._checked_rows.add(r)
+            else:
+                state = Qt.Unchecked
             item.setCheckState(state)
             model_item.setCheckState(state)
         self._refresh_text()
@@ -208,6 +226,7 @@ class MultiSelectComboBox(QComboBox):
                 continue
             item.setCheckState(Qt.Checked)
             model_item.setCheckState(Qt.Checked)
+        self._checked_rows = set(range(len(self._labels)))
         self._refresh_text()
         self.selectionChanged.emit()
 
@@ -221,21 +240,26 @@ class MultiSelectComboBox(QComboBox):
                 continue
             item.setCheckState(Qt.Unchecked)
             model_item.setCheckState(Qt.Unchecked)
+        self._checked_rows = set()
         self._refresh_text()
         self.selectionChanged.emit()
 
     def _refresh_text(self):
         chs = self.checked_items()
+        if not chs:
+            text = ""
+        elif len(chs) <= 3:
+            text = ", ".join(chs)
+        else:
+            text = f"{len(chs)} selected"
+        if text == getattr(self, "_last_text", None):
+            return
         self.setCurrentIndex(-1)
         line_edit = self.lineEdit() if self._valid_qobject(self.lineEdit()) else None
         if line_edit is None:
             return
-        if not chs:
-            line_edit.setText("")
-        elif len(chs) <= 3:
-            line_edit.setText(", ".join(chs))
-        else:
-            line_edit.setText(f"{len(chs)} selected")
+        line_edit.setText(text)
+        self._last_text = text
 
     def _toggle_row(self, row: int):
         item = self._list.item(row)
@@ -246,7 +270,11 @@ class MultiSelectComboBox(QComboBox):
         state = Qt.Checked if checked else Qt.Unchecked
         item.setCheckState(state)
         model_item.setCheckState(state)
-        self._refresh_text()
+        if checked:
+            self._checked_rows.add(row)
+        else:
+            self._checked_rows.discard(row)
+        self._refresh_timer.start(0)
         self.selectionChanged.emit()
 
     def _rebuild_popup_geometry(self):
@@ -607,7 +635,7 @@ class SoapPopsMixin:
         ordered['GAP_SEC'] = (ordered['NEXT_START'] - ordered['Stop']).round(3)
         gap_rows = ordered.loc[ordered['GAP_SEC'] > 1e-6, ['Class', 'Start', 'Stop', 'NEXT_START', 'GAP_SEC']]
 
-        probe['PHASE_SEC'] = probe['Start'].astype(float).map(lambda x: round(x % epoch_size, 3))
+        probe['PHASE_SEC'] = (probe['Start'].astype(float) % epoch_size).round(3)
         phase_counts = probe['PHASE_SEC'].value_counts().sort_values(ascending=False)
 
         has_multi_duration = len(dur_counts) > 1
@@ -689,9 +717,6 @@ class SoapPopsMixin:
             diag["message"] = "No instance attached."
             return diag
 
-        raw_df = self._stage_validation_raw_df()
-        if hasattr(self, "_profile_attach_mark"):
-            self._profile_attach_mark(f"_stage_validation_diagnostics raw_df n={len(raw_df)}")
         aligned_df = self._stage_validation_df()
         if hasattr(self, "_profile_attach_mark"):
             self._profile_attach_mark(f"_stage_validation_diagnostics aligned_df n={len(aligned_df)}")
@@ -699,7 +724,6 @@ class SoapPopsMixin:
         if hasattr(self, "_profile_attach_mark"):
             self._profile_attach_mark(f"_stage_validation_diagnostics unique={aligned_unique}")
 
-        diag["raw_df"] = raw_df
         diag["aligned_df"] = aligned_df
         diag["aligned_unique_count"] = aligned_unique
 
@@ -710,6 +734,13 @@ class SoapPopsMixin:
                 diag["message"] = "Valid staging is available after `EPOCH align`."
                 return diag
 
+        # raw annotations are only needed to explain a failure; skip the
+        # engine round trip on the happy path above
+        raw_df = self._stage_validation_raw_df()
+        if hasattr(self, "_profile_attach_mark"):
+            self._profile_attach_mark(f"_stage_validation_diagnostics raw_df n={len(raw_df)}")
+        diag["raw_df"] = raw_df
+
         if raw_df.empty:
             diag["code"] = "none_present"
             diag["message"] = (
@@ -1034,7 +1065,8 @@ class SoapPopsMixin:
         df = self.p.headers()
 
         if df is not None:
-            chs = df.loc[df['SR'] >= 32, 'CH'].tolist()
+            # numpy mask avoids the pandas boolean-indexer path
+            chs = df['CH'].to_numpy()[df['SR'].to_numpy() >= 32].tolist()
         else:
             chs = [ ]
 
@@ -26,8 +26,10 @@ from PySide6.QtWidgets import (
     QApplication, QComboBox, QStyledItemDelegate, QTableView,
     QStyle, QStyleOptionViewItem, QHeaderView
 )
-from PySide6.QtGui import QIcon, QStandardItem
+from PySide6.QtGui import QIcon, QStandardItem, QPainter, QPixmap, QPixmapCache
 from PySide6.QtGui import QGuiApplication
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import QStyleOptionComboBox
 from PySide6.QtWidgets import QFileDialog
 from ..file_dialogs import save_file_name
 
@@ -42,15 +44,35 @@ class ComboDelegate(QStyledItemDelegate):
     def __init__(self, items, parent: Optional[QObject] = None):
         super().__init__(parent)
         self.items = list(items)
+        self._size_hint = None
 
-    # do not paint the cell text when using a persistent editor
+    # paint a combo-box look from a cached pixmap; a real QComboBox only
+    # exists while the cell is being edited
     def paint(self, painter, option, index):
-        opt = QStyleOptionViewItem(option)
-        self.initStyleOption(opt, index)
-        opt.text = ""
-        opt.icon = QIcon()
-        style = opt.widget.style() if opt.widget else QApplication.style()
-        style.drawControl(QStyle.CE_ItemViewItem, opt, painter)
+        if option.state & QStyle.State_Editing:
+            return
+        text = str(index.data(Qt.DisplayRole) or "")
+        rect = option.rect
+        state = int(option.state.value) if hasattr(option.state, "value") else int(option.state)
+        key = f"combodelegate:{text}:{rect.width()}x{rect.height()}:{state}"
+        pm = QPixmapCache.find(key)
+        if pm is None or pm.isNull():
+            pm = QPixmap(rect.size())
+            pm.fill(Qt.transparent)
+            p = QPainter(pm)
+            opt = QStyleOptionComboBox()
+            if option.widget is not None:
+                opt.initFrom(option.widget)
+            opt.rect = QRect(0, 0, rect.width(), rect.height())
+            opt.state = option.state
+            opt.currentText = text
+            opt.editable = False
+            style = option.widget.style() if option.widget else QApplication.style()
+            style.drawComplexControl(QStyle.CC_ComboBox, opt, p, option.widget)
+            style.drawControl(QStyle.CE_ComboBoxLabel, opt, p, option.widget)
+            p.end()
+            QPixmapCache.insert(key, pm)
+        painter.drawPixmap(rect.topLeft(), pm)
 
     def createEditor(self, parent, option, index):
         w = QComboBox(parent)
@@ -68,7 +90,11 @@ class ComboDelegate(QStyledItemDelegate):
         editor.setGeometry(r)
                 
     def sizeHint(self, option, index):
-        return QSize(80, option.rect.height())
+        # called per visible cell per paint; reuse one QSize
+        h = option.rect.height()
+        if self._size_hint is None or self._size_hint.height() != h:
+            self._size_hint = QSize(80, h)
+        return self._size_hint
 
     def setEditorData(self, editor, index):
         val = index.data(Qt.EditRole) or index.data(Qt.DisplayRole) or ""
@@ -85,7 +111,7 @@ def add_combo_column(
     items,
     default_value: str | None = None,
     insert_source_col: int | None = None,
-    open_persistent: bool = True,
+    open_persistent: bool = False,
     on_change=None,
     width: int = 90,
     resize_mode: QHeaderView.ResizeMode = QHeaderView.Fixed,
@@ -111,18 +137,20 @@ def add_combo_column(
     ncols = src.columnCount()
 
     col = ncols if insert_source_col is None else int(insert_source_col)
-    src.insertColumn(col)
-    src.setHeaderData(col, Qt.Horizontal, header_text)
 
     if default_value is None:
         default_value = next(iter(items), "")
 
-    for r in range(nrows):
+    # build the column up front and insert it in one call
+    new_items = []
+    for _ in range(nrows):
         it = QStandardItem(str(default_value))
         it.setEditable(True)
         it.setSelectable(True)
         it.setEnabled(True)
-        src.setItem(r, col, it)
+        new_items.append(it)
+    src.insertColumn(col, new_items)
+    src.setHeaderData(col, Qt.Horizontal, header_text)
 
     # map to proxy column
     if src is proxy:
@@ -145,25 +173,61 @@ def add_combo_column(
     view.horizontalHeader().setSectionResizeMode(proxy_col, resize_mode)
     view.setColumnWidth(proxy_col, width)
 
-    # open editors so the combo is always visible
-    def _open_all_persistent():
-        prow = proxy.rowCount()
-        for r in range(prow):
-            idx = proxy.index(r, proxy_col)
-            view.openPersistentEditor(idx)
+    # fixed, uniform row heights so the view never probes per-row hints
+    vh = view.verticalHeader()
+    vh.setSectionResizeMode(QHeaderView.Fixed)
+    vh.setDefaultSectionSize(max(vh.defaultSectionSize(),
+                                 view.fontMetrics().height() + 4))
 
+    # optionally open live editors, but only for rows in the viewport,
+    # materialized lazily as the user scrolls; the delegate already
+    # paints a combo look, so this is off by default
     if open_persistent:
-        _open_all_persistent()
-
-        # keep new rows opened too
-        def _rows_inserted(*_):
-            _open_all_persistent()
-        src.rowsInserted.connect(_rows_inserted)
-
-    # optional change hook
+        _opened = set()
+
+        def _open_visible():
+            top = view.rowAt(0)
+            bottom = view.rowAt(view.viewport().height() - 1)
+            if top < 0:
+                top = 0
+            if bottom < 0:
+                bottom = proxy.rowCount() - 1
+            for r in range(top, bottom + 1):
+                if r in _opened:
+                    continue
+                idx = proxy.index(r, proxy_col)
+                if idx.isValid():
+                    view.openPersistentEditor(idx)
+                    _opened.add(r)
+
+        _scroll_timer = QTimer(view)
+        _scroll_timer.setSingleShot(True)
+        _scroll_timer.timeout.connect(_open_visible)
+
+        def _schedule_open(*_args):
+            _scroll_timer.start(0)
+
+        def _rows_shifted(*_args):
+            # row numbers moved; forget what was opened and re-probe
+            _opened.clear()
+            _scroll_timer.start(0)
+
+        view.verticalScrollBar().valueChanged.connect(_schedule_open)
+        src.rowsInserted.connect(_rows_shifted)
+        src.rowsRemoved.connect(_rows_shifted)
+        proxy.layoutChanged.connect(_rows_shifted)
+        _open_visible()
+
+    # optional change hook, coalesced so a bulk edit fires it once per
+    # event-loop tick (same pattern as add_check_column's _schedule_emit)
     if on_change is not None:
-        def _emit_change(*_):
-            on_change(None)
+        _timer = QTimer(view)
+        _timer.setSingleShot(True)
+        _timer.timeout.connect(lambda: on_change(None))
+
+        def _emit_change(top_left, bottom_right, *_roles):
+            if top_left.column() <= col <= bottom_right.column():
+                _timer.start(0)
         src.dataChanged.connect(_emit_change)
 
     return proxy_col
@@ -181,6 +245,23 @@ import types
 from PySide6.QtCore import QSignalBlocker, Qt, QTimer
 
 
+def _row_runs(rows):
+    """Collapse a sorted list of row numbers into (lo, hi) runs."""
+    runs = []
+    lo = hi = None
+    for r in rows:
+        if lo is None:
+            lo = hi = r
+        elif r == hi + 1:
+            hi = r
+        else:
+            runs.append((lo, hi))
+            lo = hi = r
+    if lo is not None:
+        runs.append((lo, hi))
+    return runs
+
+
 def add_check_column(view, channel_col_before_insert, header_text="✔",
                      initial_checked=None, on_change=None, visible_only=False):
 
@@ -192,46 +273,96 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
     if not isinstance(src, QStandardItemModel):
         raise TypeError("Expect QStandardItemModel or proxy->QStandardItemModel")
 
+    # freeze the view for the whole populate+reattach: no sorting, no
+    # repaints while the model structure is in flux
+    was_sorting = view.isSortingEnabled()
+    view.setSortingEnabled(False)
+    view.setUpdatesEnabled(False)
+
     # detach proxy during structure change
     if proxy:
         proxy.setSourceModel(None)
 
-    # insert column 0
-    src.insertColumn(0)
-    if header_text:
-        src.setHeaderData(0, Qt.Horizontal, header_text)
-
     checked = set(map(str, (initial_checked or [])))
     chan_col_after = channel_col_before_insert + 1
 
-    # populate without signals
-    src.blockSignals(True)
-    try:
-        for r in range(src.rowCount()):
-            it = QStandardItem()
-            it.setEditable(False)
-            it.setCheckable(True)
-            ch = str(src.data(src.index(r, chan_col_after)))
-            it.setCheckState(Qt.Checked if ch in checked else Qt.Unchecked)
-            it.setDragEnabled(True)
-            it.setDropEnabled(True)
-            src.setItem(r, 0, it)
-    finally:
-        src.blockSignals(False)
+    # build the check items against the pre-insert channel column, then
+    # insert the whole column in one call; mirror the checked rows in a
+    # plain set so queries need no per-row item() round-trips
+    check_items = []
+    checked_src_rows = set()
+    for r in range(src.rowCount()):
+        it = QStandardItem()
+        it.setEditable(False)
+        it.setCheckable(True)
+        ch = str(src.data(src.index(r, channel_col_before_insert)))
+        if ch in checked:
+            it.setCheckState(Qt.Checked)
+            checked_src_rows.add(r)
+        else:
+            it.setCheckState(Qt.Unchecked)
+        it.setDragEnabled(True)
+        it.setDropEnabled(True)
+        check_items.append(it)
+    src.insertColumn(0, check_items)
+    if header_text:
+        src.setHeaderData(0, Qt.Horizontal, header_text)
 
     # reattach proxy/model
-    if proxy:
-        proxy.setSourceModel(src)
-        view.setModel(proxy)
-    else:
-        view.setModel(src)
+    try:
+        if proxy:
+            proxy.setSourceModel(src)
+            view.setModel(proxy)
+        else:
+            view.setModel(src)
 
-    view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        # the checkbox column has constant width; fix it from the style
+        # metric instead of measuring any rows
+        hv = view.horizontalHeader()
+        hv.setSectionResizeMode(0, QHeaderView.Fixed)
+        view.setColumnWidth(0, view.style().pixelMetric(QStyle.PM_IndicatorWidth) + 8)
+    finally:
+        view.setUpdatesEnabled(True)
+        view.setSortingEnabled(was_sorting)
 
     # ----- state -----
     _squelch = False          # bulk guard
     _in_on_change = False     # re-entrancy guard
     _scheduled = False        # debouncer flag
+    _channels = None          # cached channel-column labels
+
+    # the channel column is static after creation; pull it into a plain
+    # list once instead of two FFI calls per row per query, and rebuild
+    # lazily if rows or channel labels ever change
+    def _get_channels():
+        nonlocal _channels
+        if _channels is None:
+            _channels = [str(src.data(src.index(r, chan_col_after)))
+                         for r in range(src.rowCount())]
+        return _channels
+
+    def _drop_channels(*_args):
+        nonlocal _channels
+        _channels = None
+
+    def _drop_channels_on_data(top_left, bottom_right, *_roles):
+        if top_left.column() <= chan_col_after <= bottom_right.column():
+            _drop_channels()
+
+    def _rows_shifted(*_args):
+        # inserts/removes renumber source rows, so the row-keyed mirror is
+        # stale along with the channel cache; rebuild it from the check
+        # items, which move with their rows
+        _drop_channels()
+        checked_src_rows.clear()
+        for r in range(src.rowCount()):
+            itm = src.item(r, 0)
+            if itm is not None and itm.checkState() == Qt.Checked:
+                checked_src_rows.add(r)
+
+    src.rowsInserted.connect(_rows_shifted)
+    src.rowsRemoved.connect(_rows_shifted)
+    src.dataChanged.connect(_drop_channels_on_data)
 
     _debounce = QTimer(view)
     _debounce.setSingleShot(True)
@@ -241,6 +372,7 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
     
     def _checked(self=view, _src=src, _proxy=proxy, _vis=visible_only, _cc=chan_col_after):
         out = []
+        chans = _get_channels()
         if _proxy and _vis:
             # robust mapping (skip invalids)
             pr = _proxy.rowCount()
@@ -252,14 +384,11 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
                 if not six.isValid():
                     continue
                 srow = six.row()
-                it = _src.item(srow, 0)
-                if it and it.checkState() == Qt.Checked:
-                    out.append(str(_src.data(_src.index(srow, _cc))))
+                if srow in checked_src_rows:
+                    out.append(chans[srow])
         else:
-            for r in range(_src.rowCount()):
-                it = _src.item(r, 0)
-                if it and it.checkState() == Qt.Checked:
-                    out.append(str(_src.data(_src.index(r, _cc))))
+            for r in sorted(checked_src_rows):
+                out.append(chans[r])
         return out
 
     _last_checked = None  # None on first emit so on_change always fires once (resets stale state)
@@ -297,6 +426,19 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
 
     def _loop_set(state, xs=None, notify=True, _src=src, _proxy=proxy, _cc=chan_col_after):
         nonlocal _squelch
+
+        # zero-work fast path: nothing to do when the request already
+        # matches the current state (e.g. re-selecting the same labels)
+        target = None if xs is None else (xs if isinstance(xs, set) else set(map(str, xs)))
+        if target is not None:
+            chans = _get_channels()
+            if {chans[r] for r in checked_src_rows} == target:
+                return
+        elif state == Qt.Checked and len(checked_src_rows) == _src.rowCount():
+            return
+        elif state == Qt.Unchecked and not checked_src_rows:
+            return
+
         _squelch = True
 
         # freeze UI and signals
@@ -313,10 +455,8 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
         b_src = QSignalBlocker(_src)
         b_prox = QSignalBlocker(_proxy) if _proxy else None
 
-        changed_any = False
+        changed_rows = []
         try:
-            target = None if xs is None else (xs if isinstance(xs, set) else set(map(str, xs)))
-
             # choose rows once
 #            if _proxy and visible_only:
             if _proxy:
@@ -332,24 +472,35 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
             else:
                 src_rows = range(_src.rowCount())
 
-            # apply updates only when needed
+            # apply updates only when needed; the mirror set stands in
+            # for per-row checkState() calls
             if target is None:
                 want = state
                 for r in src_rows:
+                    if (r in checked_src_rows) == (want == Qt.Checked):
+                        continue
                     it = _src.item(r, 0)
-                    if it and it.checkState() != want:
+                    if it:
                         it.setCheckState(want)
-                        changed_any = True
+                        if want == Qt.Checked:
+                            checked_src_rows.add(r)
+                        else:
+                            checked_src_rows.discard(r)
+                        changed_rows.append(r)
             else:
+                chans = _get_channels()
                 for r in src_rows:
-                    it = _src.item(r, 0)
-                    if not it:
+                    want_checked = chans[r] in target
+                    if (r in checked_src_rows) == want_checked:
                         continue
-                    ch = str(_src.data(_src.index(r, _cc)))
-                    want = Qt.Checked if ch in target else Qt.Unchecked
-                    if it.checkState() != want:
-                        it.setCheckState(want)
-                        changed_any = True
+                    it = _src.item(r, 0)
+                    if it:
+                        it.setCheckState(Qt.Checked if want_checked else Qt.Unchecked)
+                        if want_checked:
+                            checked_src_rows.add(r)
+                        else:
+                            checked_src_rows.discard(r)
+                        changed_rows.append(r)
 
         finally:
             del b_src
@@ -360,19 +511,21 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
             if sorting_was:
                 view.setSortingEnabled(True)
 
-            # make proxy recompute mappings before we emit
-            if proxy:
-                proxy.invalidate()
+            # only the check states changed; re-run the filter when it
+            # could see col 0, but never pay for a full re-sort (the
+            # proxy never sorts on the checkbox column)
+            if proxy and proxy.filterKeyColumn() in (-1, 0):
+                proxy.invalidateFilter()
 
             _squelch = False
 
-        # one repaint over col 0
-        rc = _src.rowCount()
-        if rc:
-            _src.dataChanged.emit(_src.index(0, 0), _src.index(rc - 1, 0), [Qt.CheckStateRole])
+        # repaint only the rows that actually changed, one emit per run
+        changed_rows.sort()
+        for lo, hi in _row_runs(changed_rows):
+            _src.dataChanged.emit(_src.index(lo, 0), _src.index(hi, 0), [Qt.CheckStateRole])
 
         # defer a single logical change until the model/proxy/view are stable
-        if changed_any and notify:
+        if changed_rows and notify:
             _schedule_emit()
 
     # bind helpers
@@ -391,10 +544,14 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
             "set_labels": lambda xs: _loop_set(Qt.PartiallyChecked, xs),
         }
 
-    # per-item handler: ignore during bulk, coalesce otherwise
+    # per-item handler: mirror state, ignore during bulk, coalesce otherwise
     def _on_item_changed(itm):
         if itm.column() != 0:
             return
+        if itm.checkState() == Qt.Checked:
+            checked_src_rows.add(itm.row())
+        else:
+            checked_src_rows.discard(itm.row())
         if _squelch:
             return
         _schedule_emit()
@@ -412,8 +569,28 @@ def add_check_column(view, channel_col_before_insert, header_text="✔",
 #
 # ------------------------------------------------------------
         
+from functools import lru_cache
+from PySide6.QtCore import QRegularExpression
+
+
+@lru_cache(maxsize=64)
+def _comma_filter_rx(text: str):
+    """Parse a comma-separated filter string into (parts, compiled regex).
+
+    Cached so backspacing through previously typed text reuses the
+    compiled pattern instead of re-escaping and recompiling it.
+    """
+    parts = tuple(s.strip() for s in text.split(',') if s.strip())
+    if not parts:
+        return parts, QRegularExpression()
+    esc = [QRegularExpression.escape(p) for p in parts]
+    rx = QRegularExpression("(" + "|".join(esc) + ")")
+    rx.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
+    return parts, rx
+
+
 def attach_comma_filter(table_view, line_edit, proxy=None):
-    from PySide6.QtCore import Qt, QRegularExpression, QSortFilterProxyModel, QTimer
+    from PySide6.QtCore import Qt, QSortFilterProxyModel, QTimer
     from shiboken6 import isValid
 
     # create new proxy only if none provided
@@ -436,7 +613,7 @@ def attach_comma_filter(table_view, line_edit, proxy=None):
         if proxy is None or not isValid(proxy):
             return
         text = pending_text["text"]
-        parts = [s.strip() for s in text.split(',') if s.strip()]
+        parts, rx = _comma_filter_rx(text)
         try:
             src = proxy.sourceModel()
         except RuntimeError:
@@ -445,13 +622,9 @@ def attach_comma_filter(table_view, line_edit, proxy=None):
             return
         if hasattr(src, "set_filter_terms"):
             try:
-                src.set_filter_terms(parts)
+                src.set_filter_terms(list(parts))
             except RuntimeError:
                 return
-        esc = [QRegularExpression.escape(p) for p in parts]
-        rx = QRegularExpression() if not parts else QRegularExpression("(" + "|".join(esc) + ")")
-        if parts:
-            rx.setPatternOptions(QRegularExpression.CaseInsensitiveOption)
         try:
             proxy.setFilterRegularExpression(rx)
         except (AttributeError, RuntimeError):
@@ -459,7 +632,12 @@ def attach_comma_filter(table_view, line_edit, proxy=None):
 
     def on_text_changed(text: str):
         pending_text["text"] = text
-        timer.start()
+        if not text.strip():
+            # clearing the box should un-filter immediately
+            timer.stop()
+            apply_filter()
+        else:
+            timer.start()
 
     old_handler = getattr(line_edit, "_comma_filter_handler", None)
     if old_handler is not None:
@@ -504,17 +682,28 @@ def set_filter_for_channel(proxy, channel_name: str, filter_code: str):
 
     src = proxy.sourceModel() if hasattr(proxy, "sourceModel") else proxy
 
-    ROWS = src.rowCount()
     CH_COL = 1
     FLT_COL = 2
 
-    # Find the source row with matching channel label
-    target_row = None
-    for r in range(ROWS):
-        ch = src.index(r, CH_COL).data(Qt.DisplayRole)
-        if ch == channel_name:
-            target_row = r
-            break
+    # Look the channel up in a cached {name: row} index rather than
+    # scanning the column; rebuilt whenever rows or channel labels change
+    if getattr(src, "_chan_index", None) is None:
+        src._chan_index = {
+            str(src.index(r, CH_COL).data(Qt.DisplayRole)): r
+            for r in range(src.rowCount())
+        }
+        if not getattr(src, "_chan_index_connected", False):
+            def _drop_index(*_args):
+                src._chan_index = None
+            def _drop_index_on_data(top_left, bottom_right, *_roles):
+                if top_left.column() <= CH_COL <= bottom_right.column():
+                    src._chan_index = None
+            src.rowsInserted.connect(_drop_index)
+            src.rowsRemoved.connect(_drop_index)
+            src.dataChanged.connect(_drop_index_on_data)
+            src._chan_index_connected = True
+
+    target_row = src._chan_index.get(channel_name)
 
     if target_row is None:
         print(f"[WARN] Channel '{channel_name}' not found in table.")
@@ -571,17 +760,20 @@ def copy_selection(
             return na_token
         return s
 
-    # Sort and get unique rows/cols
-    indexes = sorted(indexes, key=lambda x: (x.row(), x.column()))
+    # Get unique rows/cols spanning the selection
     rows = sorted({idx.row() for idx in indexes})
     cols = sorted({idx.column() for idx in indexes})
 
-    # Build lookup for cell values
-    values = {}
+    # scatter the selected values into a dense grid pre-filled with the
+    # empty token; non-selected cells inside the rectangle stay empty/NA
+    rows_idx = {r: i for i, r in enumerate(rows)}
+    cols_idx = {c: j for j, c in enumerate(cols)}
+    empty = fmt_val(None)
+    grid = [[empty] * len(cols) for _ in rows]
+    m_data = model.data
+    role = Qt.DisplayRole
     for idx in indexes:
-        r, c = idx.row(), idx.column()
-        val = model.data(idx, Qt.DisplayRole)
-        values[(r, c)] = fmt_val(val)
+        grid[rows_idx[idx.row()]][cols_idx[idx.column()]] = fmt_val(m_data(idx, role))
 
     lines = []
 
@@ -594,10 +786,7 @@ def copy_selection(
         lines.append("\t".join(header_cells))
 
     # Data rows
-    for r in rows:
-        # for non-selected cells inside the rectangular block, treat as empty/NA
-        row_cells = [values.get((r, c), fmt_val(None)) for c in cols]
-        lines.append("\t".join(row_cells))
+    lines.extend("\t".join(row) for row in grid)
 
     text = "\n".join(lines)
     QGuiApplication.clipboard().setText(text)
@@ -647,21 +836,25 @@ def save_table_as_tsv(view,_self):
             return na_token
         return s
 
-    with open(path, "w", encoding="utf-8") as f:
+    # hoist the hot-loop lookups to locals; one write per file
+    m_index = model.index
+    m_data = model.data
+    role = Qt.DisplayRole
+    fv = fmt_val
+
+    header_cells = []
+    for c in range(cols):
+        hdr = model.headerData(c, Qt.Horizontal, role)
+        header_cells.append("" if hdr is None else str(hdr))
+
+    lines = ["\t".join(header_cells)]
+    lines.extend(
+        "\t".join(fv(m_data(m_index(r, c), role)) for c in range(cols))
+        for r in range(rows)
+    )
 
-        # --- HEADER ROW (corrected) ---
-        header_cells = []
-        for c in range(cols):
-            hdr = model.headerData(c, Qt.Horizontal, Qt.DisplayRole)
-            header_cells.append("" if hdr is None else str(hdr))
-        f.write("\t".join(header_cells) + "\n")
-
-        # --- DATA ROWS ---
-        for r in range(rows):
-            row_cells = []
-            for c in range(cols):
-                idx = model.index(r, c)
-                val = model.data(idx, Qt.DisplayRole)
-                row_cells.append(fmt_val(val))
-            f.write("\t".join(row_cells) + "\n")
+    # encode once and write the whole buffer in a single call
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
             
@@ -26,6 +26,7 @@ import lunapi as lp
 import pandas as pd
 
 import os, sys, threading, time
+from functools import lru_cache
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
@@ -40,8 +41,6 @@ from PySide6.QtGui import QKeySequence, QGuiApplication
 from .file_dialogs import open_file_name, save_file_name
 from . import updater as _updater
 
-import pyqtgraph as pg
-
 from  .helpers import (
     AppFontController, Blocker, add_dock_shortcuts, clear_rows,
     override_colors, pick_two_colors, random_darkbg_colors,
@@ -75,6 +74,31 @@ from .session_state import save_session_file, load_session_file, save_geometry_f
 from .runtime_paths import app_state_file
 
 
+# filter label -> frqs: immutable band reference data, hoisted so
+# _clear_all doesn't rebuild the literals on every record clear
+_DEFAULT_FMAP_FRQS = {
+    "0.3-35Hz": (0.3, 35),
+    "Slow": (0.5, 1),
+    "Delta": (1, 4),
+    "Theta": (4, 8),
+    "Alpha": (8, 11),
+    "Sigma": (11, 15),
+    "Beta": (15, 30),
+    "Gamma": (30, 50),
+    "User": (),
+}
+
+
+@lru_cache(maxsize=1)
+def _lp_version():
+    # lunapi/Luna version strings are immutable for the process lifetime;
+    # query the C extension once rather than per dialog open
+    try:
+        return lp.version()
+    except Exception:
+        return {}
+
+
 # ------------------------------------------------------------
 # main GUI controller class
 
@@ -165,6 +189,13 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         self._geometry_cache_saved = False
         self.ui.installEventFilter(self)
 
+        # table proxies and canvases; the component inits below replace
+        # these, the None defaults let _clear_all use direct reads
+        self.events_table_proxy = None
+        self.anal_table_proxy = None
+        self.signals_table_proxy = None
+        self.annots_table_proxy = None
+
         # initiate each component
         self._init_colors()
         self._init_cmaps()
@@ -190,78 +221,59 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         for v in self.ui.findChildren(QTableView):
             v.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
-        # set up menu items: open projects
-        act_load_slist = QAction("Load S-List", self)
-        act_save_slist = QAction("Save S-List...", self)
-        act_build_slist = QAction("Build S-List", self)
-        act_attach_annots = QAction("Attach Annotation Folder to S-List", self)
-        act_load_meta = QAction("Load Metadata File…", self)
-        act_clear_meta = QAction("Clear Metadata", self)
-        act_load_edf = QAction("Load EDF", self)
-        act_new_empty_edf = QAction("New Empty EDF…", self)
-        act_load_annot = QAction("Load Annotations", self)
-        act_save_edf = QAction("Export EDF + Annotations…", self)
-        act_drop_signals = QAction("Drop channels / annotations…", self)
-        act_refresh = QAction("Refresh", self)
-        act_single_eval = QAction("Evaluate", self)
-        act_refresh_single_eval = QAction("Refresh && Evaluate", self)
-        act_proj_eval = QAction("Evaluate (project)", self)
-        act_save_session = QAction("Save Session...", self)
-        act_load_session = QAction("Load Session...", self)
-        act_download_pops = QAction("Download POPS Resources...", self)
-        act_download_tutorial = QAction("Download Tutorial...", self)
-
-        # connect to same slots as buttons
-        act_load_slist.triggered.connect(self.open_file)
-        act_save_slist.triggered.connect(self.save_file)
-        act_build_slist.triggered.connect(self.open_folder)
-        act_attach_annots.triggered.connect(self._attach_annotation_folder)
-        act_load_meta.triggered.connect(self._load_meta_interactive)
-        act_clear_meta.triggered.connect(self._clear_meta)
-        act_load_edf.triggered.connect(self.open_edf)
-        act_new_empty_edf.triggered.connect(self._new_empty_edf_dialog)
-        act_load_annot.triggered.connect(self.open_annot)
-        act_save_edf.triggered.connect(self._save_edf_annots)
-        act_drop_signals.triggered.connect(self._drop_signals_annots)
-        act_refresh.triggered.connect(self._refresh)
-        act_refresh.setShortcut(QKeySequence("Ctrl+L"))
-        act_refresh.setShortcutContext(Qt.ApplicationShortcut)
-        act_single_eval.triggered.connect(self._exec_single_luna)
-        act_single_eval.setShortcut(QKeySequence("Ctrl+Return"))
-        act_single_eval.setShortcutContext(Qt.ApplicationShortcut)
-        act_refresh_single_eval.triggered.connect(self._refresh_and_exec_single_luna)
-        act_refresh_single_eval.setShortcut(QKeySequence("Ctrl+Alt+Return"))
-        act_refresh_single_eval.setShortcutContext(Qt.ApplicationShortcut)
-        act_proj_eval.triggered.connect(self._proj_eval)
-        act_proj_eval.setShortcut(QKeySequence("Ctrl+Shift+Return"))
-        act_proj_eval.setShortcutContext(Qt.ApplicationShortcut)
-        act_save_session.triggered.connect(self._save_session_state)
-        act_load_session.triggered.connect(self._load_session_state)
-        act_download_pops.triggered.connect(self._download_pops_resources)
-        act_download_tutorial.triggered.connect(self._download_tutorial)
-        self._act_proj_eval = act_proj_eval
-
-        self.ui.menuProject.addAction(act_load_slist)
-        self.ui.menuProject.addAction(act_save_slist)
-        self.ui.menuProject.addAction(act_build_slist)
-        self.ui.menuProject.addAction(act_attach_annots)
-        self.ui.menuProject.addAction(act_load_meta)
-        self.ui.menuProject.addAction(act_clear_meta)
-        self.ui.menuProject.addSeparator()
-        self.ui.menuProject.addAction(act_load_edf)
-        self.ui.menuProject.addAction(act_new_empty_edf)
-        self.ui.menuProject.addAction(act_load_annot)
-        self.ui.menuProject.addAction(act_save_edf)
-        self.ui.menuProject.addAction(act_drop_signals)
-        self.ui.menuProject.addSeparator()
-        self.ui.menuProject.addAction(act_refresh)
-        self.ui.menuProject.addSeparator()
-        self.ui.menuProject.addAction(act_single_eval)
-        self.ui.menuProject.addAction(act_refresh_single_eval)
-        self.ui.menuProject.addAction(act_proj_eval)
-        self.ui.menuProject.addSeparator()
-        self.ui.menuProject.addAction(act_download_pops)
-        self.ui.menuProject.addAction(act_download_tutorial)
+        # set up menu items, declaratively: each row is
+        # (help key or None, text, slot, shortcut or None); None = separator
+        self._help_actions = {}
+
+        def _make_action(text, slot, shortcut=None):
+            act = QAction(text, self)
+            act.triggered.connect(slot)
+            if shortcut:
+                act.setShortcut(QKeySequence(shortcut))
+                act.setShortcutContext(Qt.ApplicationShortcut)
+            return act
+
+        def _populate_menu(menu, spec):
+            for entry in spec:
+                if entry is None:
+                    menu.addSeparator()
+                    continue
+                key, text, slot, shortcut = entry
+                act = _make_action(text, slot, shortcut)
+                menu.addAction(act)
+                if key:
+                    self._help_actions[key] = act
+
+        _populate_menu(self.ui.menuProject, [
+            ("project_load_slist", "Load S-List", self.open_file, None),
+            ("project_save_slist", "Save S-List...", self.save_file, None),
+            ("project_build_slist", "Build S-List", self.open_folder, None),
+            ("project_attach_annots", "Attach Annotation Folder to S-List", self._attach_annotation_folder, None),
+            (None, "Load Metadata File…", self._load_meta_interactive, None),
+            (None, "Clear Metadata", self._clear_meta, None),
+            None,
+            ("project_load_edf", "Load EDF", self.open_edf, None),
+            (None, "New Empty EDF…", self._new_empty_edf_dialog, None),
+            ("project_load_annot", "Load Annotations", self.open_annot, None),
+            (None, "Export EDF + Annotations…", self._save_edf_annots, None),
+            (None, "Drop channels / annotations…", self._drop_signals_annots, None),
+            None,
+            ("project_refresh", "Refresh", self._refresh, "Ctrl+L"),
+            None,
+            ("project_single_eval", "Evaluate", self._exec_single_luna, "Ctrl+Return"),
+            ("project_refresh_single_eval", "Refresh && Evaluate", self._refresh_and_exec_single_luna, "Ctrl+Alt+Return"),
+            ("project_eval", "Evaluate (project)", self._proj_eval, "Ctrl+Shift+Return"),
+            None,
+            ("project_download_pops", "Download POPS Resources...", self._download_pops_resources, None),
+            ("project_download_tutorial", "Download Tutorial...", self._download_tutorial, None),
+        ])
+        self._act_proj_eval = self._help_actions["project_eval"]
+
+        # session save/load sit in the help map but not in the menu
+        self._help_actions["project_save_session"] = _make_action(
+            "Save Session...", self._save_session_state)
+        self._help_actions["project_load_session"] = _make_action(
+            "Load Session...", self._load_session_state)
 
         # set up menu items: viewing
         self.ui.menuView.addAction(self.ui.dock_slist.toggleViewAction())
@@ -338,60 +350,22 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         act_check_update.triggered.connect(self._check_for_updates)
         
         # palette menu
-        act_pal_spectrum = QAction("Spectrum", self)
-        act_pal_white    = QAction("White", self)
-        act_pal_muted    = QAction("Muted", self)
-        act_pal_black    = QAction("Black", self)
-        act_pal_random   = QAction("Random", self)
-#        act_pal_load     = QAction("Bespoke (load)", self)
-        act_pal_bespoke  = QAction("Bespoke (apply)", self)
-        act_pal_user     = QAction("Pick", self)
-
-        act_pal_spectrum.triggered.connect(self._set_spectrum_palette)
-        act_pal_white.triggered.connect(self._set_white_palette)
-        act_pal_muted.triggered.connect(self._set_muted_palette)
-        act_pal_black.triggered.connect(self._set_black_palette)
-        act_pal_random.triggered.connect(self._set_random_palette)
-#        act_pal_load.triggered.connect(self._load_palette)
-        act_pal_bespoke.triggered.connect(self._set_bespoke_palette)
-        act_pal_user.triggered.connect(self._select_user_palette)
-
-        self._help_actions = {
-            "project_load_slist": act_load_slist,
-            "project_save_slist": act_save_slist,
-            "project_build_slist": act_build_slist,
-            "project_attach_annots": act_attach_annots,
-            "project_load_edf": act_load_edf,
-            "project_load_annot": act_load_annot,
-            "project_refresh": act_refresh,
-            "project_single_eval": act_single_eval,
-            "project_refresh_single_eval": act_refresh_single_eval,
-            "project_eval": act_proj_eval,
-            "project_save_session": act_save_session,
-            "project_load_session": act_load_session,
-            "project_download_pops": act_download_pops,
-            "project_download_tutorial": act_download_tutorial,
-            "about_help": act_about,
-            "palette_spectrum": act_pal_spectrum,
-            "palette_white": act_pal_white,
-            "palette_muted": act_pal_muted,
-            "palette_black": act_pal_black,
-            "palette_random": act_pal_random,
-            "palette_pick": act_pal_user,
-            "palette_bespoke": act_pal_bespoke,
-        }
-        
-        self.ui.menuPalettes.addAction(act_pal_spectrum)
-        self.ui.menuPalettes.addAction(act_pal_white)
-        self.ui.menuPalettes.addAction(act_pal_muted)
-        self.ui.menuPalettes.addAction(act_pal_black)
-        self.ui.menuPalettes.addAction(act_pal_random)
-        self.ui.menuPalettes.addSeparator()
-        self.ui.menuPalettes.addAction(act_pal_user)
-        self.ui.menuPalettes.addSeparator()
-#        self.ui.menuPalettes.addAction(act_pal_load)
-        self.ui.menuPalettes.addAction(act_pal_bespoke)
-        
+        _populate_menu(self.ui.menuPalettes, [
+            ("palette_spectrum", "Spectrum", self._set_spectrum_palette, None),
+            ("palette_white", "White", self._set_white_palette, None),
+            ("palette_muted", "Muted", self._set_muted_palette, None),
+            ("palette_black", "Black", self._set_black_palette, None),
+            ("palette_random", "Random", self._set_random_palette, None),
+            None,
+            ("palette_pick", "Pick", self._select_user_palette, None),
+            None,
+#            ("palette_load", "Bespoke (load)", self._load_palette, None),
+            ("palette_bespoke", "Bespoke (apply)", self._set_bespoke_palette, None),
+        ])
+
+        self._help_actions["about_help"] = act_about
+
+
         # about menu
         self.ui.menuAbout.addAction(act_about)
         self.ui.menuAbout.addSeparator()
@@ -598,16 +572,20 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
 
     def _update_mode_badge(self):
         multiday = getattr(self, "multiday_mode", False)
-        if multiday:
-            self.sb_mode.setText("Multiple days")
-            self.sb_mode.setStyleSheet(
-                "QLabel { color: #f2d48f; background: rgba(88,64,18,0.35); border: 1px solid rgba(222,184,82,0.35); }"
-            )
-        else:
-            self.sb_mode.setText("Single night")
-            self.sb_mode.setStyleSheet(
-                "QLabel { color: #b8c4d6; background: rgba(33,44,62,0.28); border: 1px solid rgba(120,140,170,0.2); }"
-            )
+        # only restyle on an actual mode flip; re-setting the same sheet
+        # forces a style recompute on every attach/clear
+        if multiday != getattr(self, "_mode_badge_multiday", None):
+            self._mode_badge_multiday = multiday
+            if multiday:
+                self.sb_mode.setText("Multiple days")
+                self.sb_mode.setStyleSheet(
+                    "QLabel { color: #f2d48f; background: rgba(88,64,18,0.35); border: 1px solid rgba(222,184,82,0.35); }"
+                )
+            else:
+                self.sb_mode.setText("Single night")
+                self.sb_mode.setStyleSheet(
+                    "QLabel { color: #b8c4d6; background: rgba(33,44,62,0.28); border: 1px solid rgba(120,140,170,0.2); }"
+                )
         # Gray out whichever Ctrl+7 dock is not relevant for the current mode
         if hasattr(self, "_act_hypno_menu"):
             self._act_hypno_menu.setEnabled(not multiday)
@@ -788,8 +766,10 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         self.proj.clear_vars()
         self.proj.reinit()
         param = self._parse_tab_pairs( self.ui.txt_param )
-        for p in param:
-            self.proj.var( p[0] , p[1] )
+        if param:
+            # proj.var accepts a {name: value} dict: one engine call
+            # instead of one per pair (later duplicates still win)
+            self.proj.var( dict(param) )
         self._profile_attach_mark("project vars/reinit")
         
         # attach EDF
@@ -923,19 +903,19 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         self.ss_chs = []
         self.ss_anns = []
 
-        if getattr(self, "events_table_proxy", None) is not None:
+        if self.events_table_proxy is not None:
             clear_rows( self.events_table_proxy )
 
-        if getattr(self, "anal_table_proxy", None) is not None:
+        if self.anal_table_proxy is not None:
             clear_rows( self.anal_table_proxy , keep_headers = False )
 
-        if getattr(self, "signals_table_proxy", None) is not None:
+        if self.signals_table_proxy is not None:
             clear_rows( self.signals_table_proxy )
 
-        if getattr(self, "annots_table_proxy", None) is not None:
+        if self.annots_table_proxy is not None:
             clear_rows( self.annots_table_proxy )
 
-        clear_rows( self.ui.anal_tables ) 
+        clear_rows( self.ui.anal_tables )
 
         self.ui.combo_spectrogram.blockSignals(True)
         self.ui.combo_spectrogram.clear()
@@ -947,17 +927,14 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         if not getattr(self, "project_mode", False):
             self.ui.txt_out.clear()
         
-        if getattr(self, "spectrogramcanvas", None) is not None:
-            self.spectrogramcanvas.ax.cla()
-            self.spectrogramcanvas.figure.canvas.draw_idle()
+        for name in ("spectrogramcanvas", "hypnocanvas", "actigraphycanvas",
+                     "soapcanvas", "popscanvas"):
+            canvas = getattr(self, name, None)
+            if canvas is not None:
+                canvas.ax.cla()
+                # hidden docks defer the redraw to their next showEvent
+                canvas.draw_idle_visible()
 
-        if getattr(self, "hypnocanvas", None) is not None:
-            self.hypnocanvas.ax.cla()
-            self.hypnocanvas.figure.canvas.draw_idle()
-
-        if getattr(self, "actigraphycanvas", None) is not None:
-            self.actigraphycanvas.ax.cla()
-            self.actigraphycanvas.figure.canvas.draw_idle()
         if hasattr(self, "_update_actigraphy_summary"):
             self._update_actigraphy_summary()
         self.multiday_mode = False
@@ -967,31 +944,15 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
             self._sync_multiday_actigraphy_dock()
         self._detach_actigraphy_dock_from_main_layout()
 
-        if getattr(self, "soapcanvas", None) is not None:
-            self.soapcanvas.ax.cla()
-            self.soapcanvas.figure.canvas.draw_idle()
-
-        if getattr(self, "popscanvas", None) is not None:
-            self.popscanvas.ax.cla()
-            self.popscanvas.figure.canvas.draw_idle()
-
         # POPS results
         self.pops_df = pd.DataFrame()
         
         # filters: chennels -> filters
         self.fmap = { }
 
-        # filter label -> frqs
-        self.fmap_frqs = {
-            "0.3-35Hz": [0.3,35] ,
-            "Slow": [0.5,1] ,
-            "Delta": [1,4],
-            "Theta": [4,8],
-            "Alpha": [8,11],
-            "Sigma": [11,15],
-            "Beta": [15,30] ,
-            "Gamma": [30,50] ,
-            "User": [ ] } 
+        # filter label -> frqs (band tuples shared with the module constant;
+        # consumers only read them)
+        self.fmap_frqs = dict(_DEFAULT_FMAP_FRQS)
 
         # user-speific filter map: { ch : [ lwr , upr ] } 
         self.user_fmap_frqs = { } 
@@ -1056,11 +1017,11 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         box.setTextFormat(Qt.RichText)
 
         # compute versions
-        x = lp.version()  # { lunapi:ver, luna:ver }
+        x = _lp_version()  # { lunapi:ver, luna:ver }
         box.setText(
             f"<p>Lunascope v{__version__}</p>"
-            f"<p>Lunapi {x['lunapi']}</p>"
-            f"<p>Luna {x['luna']}</p>"
+            f"<p>Lunapi {x.get('lunapi', '?')}</p>"
+            f"<p>Luna {x.get('luna', '?')}</p>"
             "<p>Documentation:<br> <a href='http://zzz-luna.org/lunascope'>"
             "http://zzz-luna.org/lunascope</a></p>"
             "<p>Created by Shaun Purcell</p>"
@@ -1098,12 +1059,10 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
         app_meta = {
             "lunascope_version": __version__,
         }
-        try:
-            x = lp.version()
+        x = _lp_version()
+        if x:
             app_meta["lunapi_version"] = x.get("lunapi")
             app_meta["luna_version"] = x.get("luna")
-        except Exception:
-            pass
 
         try:
             session_meta = {}
@@ -1115,12 +1074,22 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
             model = self.ui.tbl_slist.model() if hasattr(self.ui, "tbl_slist") else None
             rows = []
             if model is not None:
-                for r in range(model.rowCount()):
-                    row = []
-                    for c in range(3):
-                        idx = model.index(r, c)
-                        row.append(str(model.data(idx, Qt.DisplayRole) or ""))
-                    rows.append(row)
+                src = model.sourceModel() if hasattr(model, "sourceModel") else model
+                df = getattr(src, "_df", None)
+                if (df is not None and len(df.columns) >= 3
+                        and model.rowCount() == src.rowCount()):
+                    # unfiltered DataFrame-backed model: harvest the three
+                    # columns in bulk instead of one Qt call per cell
+                    cols = [src._formatted_string_series(col, c).tolist()
+                            for c, col in enumerate(df.columns[:3])]
+                    rows = [list(t) for t in zip(*cols)]
+                else:
+                    m_index = model.index
+                    m_data = model.data
+                    role = Qt.DisplayRole
+                    for r in range(model.rowCount()):
+                        rows.append([str(m_data(m_index(r, c), role) or "")
+                                     for c in range(3)])
             if rows:
                 session_meta["sample_rows"] = rows
 
@@ -1205,15 +1174,19 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
                     self.proj.eng.set_sample_list(sample_rows)
                     self._slist_loaded_key = None
                     self._slist_proj_dirty = False
-                    df = self.proj.sample_list()
-                    model = self.sample_list_df_to_model(df)
-                    self._proxy.setSourceModel(model)
+                    # reloading the same session: the table already shows
+                    # these rows, so skip the model rebuild and re-layout
+                    if not self._slist_view_matches_rows(sample_rows):
+                        df = self.proj.sample_list()
+                        model = self.sample_list_df_to_model(df)
+                        self._proxy.setSourceModel(model)
+                        self._configure_slist_view()
                     if hasattr(self, "_set_slist_label"):
                         self._set_slist_label("<internal>")
                     else:
                         self.ui.lbl_slist.setText("<internal>")
-                    self._configure_slist_view()
-                    if model.rowCount() > 0:
+                    model = self.ui.tbl_slist.model()
+                    if model is not None and model.rowCount() > 0:
                         row = max(0, min(selected_row, model.rowCount() - 1))
                         self.ui.tbl_slist.setCurrentIndex(model.index(row, 0))
                         self.ui.tbl_slist.selectRow(row)
@@ -1230,6 +1203,26 @@ class Controller( QObject, CMapsMixin, ResultsIOMixin,
                 f"Loaded session, but project context was not fully restored.\n\n{slist_load_note}",
             )
 
+    def _slist_view_matches_rows(self, rows) -> bool:
+        """True when tbl_slist already displays exactly these sample rows.
+
+        Compared against the live model rather than a cached hash so
+        table changes made through other paths can never fool the check.
+        """
+        view = getattr(self.ui, "tbl_slist", None)
+        model = view.model() if view is not None else None
+        if model is None:
+            return False
+        src = model.sourceModel() if hasattr(model, "sourceModel") else model
+        df = getattr(src, "_df", None)
+        if (df is None or len(df.columns) < 3
+                or len(df) != len(rows) or model.rowCount() != len(rows)):
+            return False
+        cols = [src._formatted_string_series(col, c).tolist()
+                for c, col in enumerate(df.columns[:3])]
+        current = [list(t) for t in zip(*cols)]
+        return current == [[str(v) for v in r[:3]] for r in rows]
+
     def _geometry_cache_path(self) -> Path:
         return app_state_file("window_geometry.json")
 
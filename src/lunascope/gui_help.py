@@ -163,10 +163,17 @@ ACTION_HELP: dict[str, str] = {
 def _apply_text_help(obj: Any, text: str) -> None:
     if not text:
         return
-    for meth in ("setToolTip", "setStatusTip", "setWhatsThis"):
-        fn = getattr(obj, meth, None)
-        if callable(fn):
-            fn(text)
+    try:
+        # Every QWidget/QAction has all three setters; probe only on the
+        # odd object out.
+        obj.setToolTip(text)
+        obj.setStatusTip(text)
+        obj.setWhatsThis(text)
+    except AttributeError:
+        for meth in ("setToolTip", "setStatusTip", "setWhatsThis"):
+            fn = getattr(obj, meth, None)
+            if callable(fn):
+                fn(text)
 
 
 def apply_gui_help(ui: Any, actions: dict[str, Any] | None = None) -> None:
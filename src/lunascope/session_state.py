@@ -34,8 +34,13 @@ Design goals:
 
 from __future__ import annotations
 
-import base64
 import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -61,7 +66,7 @@ SCHEMA_VERSION = 1
 # Phase 1 intentionally excludes runtime/data-dependent combo boxes.
 # They depend on attached EDF/sample content and transforms, which are not
 # frozen/restored in Phase 1.
-EXCLUDED_COMBO_BOXES = {
+EXCLUDED_COMBO_BOXES = frozenset({
     "combo_pops",
     "combo_soap",
     "combo_ifnot_mask",
@@ -72,12 +77,18 @@ EXCLUDED_COMBO_BOXES = {
     "combo_irasa_component",
     "combo_coh_metric",
     "combo_annotator_mode",
-}
+})
 
 # Transient action toggles should not be restored across runs/sessions.
-EXCLUDED_CHECK_BOXES = {
+EXCLUDED_CHECK_BOXES = frozenset({
     "check_hypno_annots",
-}
+})
+
+# Regenerated output buffers: potentially huge and recomputed on evaluate,
+# so persisting them only bloats the session file.
+EXCLUDED_PLAIN_TEXT_EDITS = frozenset({
+    "txt_out",
+})
 
 
 @dataclass
@@ -104,19 +115,51 @@ def _now_utc() -> str:
 
 
 def _b64_qba(data: QByteArray) -> str:
-    return base64.b64encode(bytes(data)).decode("ascii")
+    # Qt encodes in C++ on the existing buffer; bytes(data) would copy first.
+    return bytes(data.toBase64()).decode("ascii")
 
 
 def _qba_from_b64(text: str) -> QByteArray:
-    raw = base64.b64decode(text.encode("ascii"))
-    return QByteArray(raw)
+    return QByteArray.fromBase64(QByteArray(text.encode("ascii")))
+
+
+# Widget classes the collectors below care about, most-derived first so
+# isinstance bucketing assigns each widget to exactly one class.
+_INDEXED_CLASSES = (
+    QDockWidget,
+    QLineEdit,
+    QPlainTextEdit,
+    QSpinBox,
+    QDoubleSpinBox,
+    QCheckBox,
+    QRadioButton,
+    QComboBox,
+    QTabWidget,
+)
+
 
+def _index_widgets(root: QWidget) -> dict[type, list[tuple[str, QWidget]]]:
+    """Bucket every named descendant by class with a single tree walk.
 
-def _iter_named_widgets(root: QWidget, klass: type[QWidget]):
-    for w in root.findChildren(klass):
+    findChildren() is a full recursive C++ traversal per call; the
+    collectors used to run it once per widget class.  One pass over
+    findChildren(QWidget) feeds them all.  The QWidget bucket holds all
+    named widgets for the auxiliary dock scan in _collect_docks.
+    """
+    buckets: dict[type, list[tuple[str, QWidget]]] = {
+        klass: [] for klass in _INDEXED_CLASSES
+    }
+    buckets[QWidget] = []
+    for w in root.findChildren(QWidget):
         name = w.objectName()
-        if name:
-            yield name, w
+        if not name:
+            continue
+        buckets[QWidget].append((name, w))
+        for klass in _INDEXED_CLASSES:
+            if isinstance(w, klass):
+                buckets[klass].append((name, w))
+                break
+    return buckets
 
 
 def _collect_window(ui: QMainWindow) -> dict[str, Any]:
@@ -128,9 +171,9 @@ def _collect_window(ui: QMainWindow) -> dict[str, Any]:
     return out
 
 
-def _collect_docks(ui: QMainWindow) -> dict[str, dict[str, Any]]:
+def _collect_docks(buckets: dict[type, list[tuple[str, QWidget]]]) -> dict[str, dict[str, Any]]:
     docks: dict[str, dict[str, Any]] = {}
-    for name, dock in _iter_named_widgets(ui, QDockWidget):
+    for name, dock in buckets.get(QDockWidget, ()):
         geom_b64 = ""
         try:
             geom_b64 = _b64_qba(dock.saveGeometry())
@@ -145,7 +188,7 @@ def _collect_docks(ui: QMainWindow) -> dict[str, dict[str, Any]]:
     # Auxiliary dock-like windows (Explorer, Predict, Moonbeam, etc.) are
     # plain QWidget top-levels rather than QDockWidget, but they still expose
     # stable object names and save/restoreGeometry().
-    for name, widget in _iter_named_widgets(ui, QWidget):
+    for name, widget in buckets.get(QWidget, ()):
         if name in docks or not name.startswith("dock_"):
             continue
         if isinstance(widget, QDockWidget):
@@ -168,37 +211,60 @@ def _collect_docks(ui: QMainWindow) -> dict[str, dict[str, Any]]:
     return docks
 
 
-def _collect_line_edits(ui: QWidget) -> dict[str, str]:
-    return {name: w.text() for name, w in _iter_named_widgets(ui, QLineEdit)}
-
-
-def _collect_plain_text_edits(ui: QWidget) -> dict[str, str]:
-    return {name: w.toPlainText() for name, w in _iter_named_widgets(ui, QPlainTextEdit)}
-
-
-def _collect_spin_boxes(ui: QWidget) -> dict[str, int]:
-    return {name: int(w.value()) for name, w in _iter_named_widgets(ui, QSpinBox)}
-
-
-def _collect_double_spin_boxes(ui: QWidget) -> dict[str, float]:
-    return {name: float(w.value()) for name, w in _iter_named_widgets(ui, QDoubleSpinBox)}
+# Uniform value-carrying widget types, collected and restored by one
+# table-driven pass each.  Combo and tab widgets keep dedicated handlers
+# for their record shape and deferred/validated restores.
+# Columns: state key, class, getter, setter, cast, excluded names,
+# skip falsy values on collect.
+_VALUE_SPECS: tuple[tuple[str, type, str, str, Any, frozenset, bool], ...] = (
+    # Empty text fields are omitted: restore leaves absent widgets
+    # untouched, which for a fresh window is the same empty state.
+    ("line_edits", QLineEdit, "text", "setText", str, frozenset(), True),
+    ("plain_text_edits", QPlainTextEdit, "toPlainText", "setPlainText", str,
+     EXCLUDED_PLAIN_TEXT_EDITS, True),
+    ("spin_boxes", QSpinBox, "value", "setValue", int, frozenset(), False),
+    ("double_spin_boxes", QDoubleSpinBox, "value", "setValue", float, frozenset(), False),
+    ("check_boxes", QCheckBox, "isChecked", "setChecked", bool, EXCLUDED_CHECK_BOXES, False),
+    ("radio_buttons", QRadioButton, "isChecked", "setChecked", bool, frozenset(), False),
+)
 
 
-def _collect_check_boxes(ui: QWidget) -> dict[str, bool]:
-    return {
-        name: bool(w.isChecked())
-        for name, w in _iter_named_widgets(ui, QCheckBox)
-        if name not in EXCLUDED_CHECK_BOXES
-    }
+def _collect_values(buckets: dict[type, list[tuple[str, QWidget]]]) -> dict[str, dict[str, Any]]:
+    out: dict[str, dict[str, Any]] = {}
+    for key, klass, getter, _setter, cast, excluded, skip_empty in _VALUE_SPECS:
+        vals: dict[str, Any] = {}
+        for name, w in buckets.get(klass, ()):
+            if name in excluded:
+                continue
+            v = cast(getattr(w, getter)())
+            if skip_empty and not v:
+                continue
+            vals[name] = v
+        out[key] = vals
+    return out
 
 
-def _collect_radio_buttons(ui: QWidget) -> dict[str, bool]:
-    return {name: bool(w.isChecked()) for name, w in _iter_named_widgets(ui, QRadioButton)}
+def _apply_values(idx: dict[tuple[type, str], QWidget], widgets: dict[str, Any], report: RestoreReport) -> None:
+    for key, klass, _getter, setter, cast, excluded, _skip_empty in _VALUE_SPECS:
+        for name, val in widgets.get(key, {}).items():
+            if name in excluded:
+                continue
+            w = idx.get((klass, name))
+            if w is None:
+                report.missing += 1
+                report.missing_items.append(f"{klass.__name__}:{name}")
+                continue
+            try:
+                getattr(w, setter)(cast(val))
+                report.restored += 1
+            except Exception:
+                report.skipped += 1
+                report.skipped_items.append(f"{klass.__name__}:{name}:invalid_value")
 
 
-def _collect_combo_boxes(ui: QWidget) -> dict[str, dict[str, Any]]:
+def _collect_combo_boxes(buckets: dict[type, list[tuple[str, QWidget]]]) -> dict[str, dict[str, Any]]:
     out: dict[str, dict[str, Any]] = {}
-    for name, w in _iter_named_widgets(ui, QComboBox):
+    for name, w in buckets.get(QComboBox, ()):
         if name in EXCLUDED_COMBO_BOXES:
             continue
         out[name] = {
@@ -208,8 +274,8 @@ def _collect_combo_boxes(ui: QWidget) -> dict[str, dict[str, Any]]:
     return out
 
 
-def _collect_tab_widgets(ui: QWidget) -> dict[str, int]:
-    return {name: int(w.currentIndex()) for name, w in _iter_named_widgets(ui, QTabWidget)}
+def _collect_tab_widgets(buckets: dict[type, list[tuple[str, QWidget]]]) -> dict[str, int]:
+    return {name: int(w.currentIndex()) for name, w in buckets.get(QTabWidget, ())}
 
 
 def collect_session_state(
@@ -218,79 +284,40 @@ def collect_session_state(
     app_meta: dict[str, Any] | None = None,
     session_meta: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    buckets = _index_widgets(ui)
+    widgets = _collect_values(buckets)
+    widgets["combo_boxes"] = _collect_combo_boxes(buckets)
+    widgets["tab_widgets"] = _collect_tab_widgets(buckets)
     state = {
         "schema_version": SCHEMA_VERSION,
         "saved_utc": _now_utc(),
         "app": app_meta or {},
         "session": session_meta or {},
         "window": _collect_window(ui),
-        "docks": _collect_docks(ui),
-        "widgets": {
-            "line_edits": _collect_line_edits(ui),
-            "plain_text_edits": _collect_plain_text_edits(ui),
-            "spin_boxes": _collect_spin_boxes(ui),
-            "double_spin_boxes": _collect_double_spin_boxes(ui),
-            "check_boxes": _collect_check_boxes(ui),
-            "radio_buttons": _collect_radio_buttons(ui),
-            "combo_boxes": _collect_combo_boxes(ui),
-            "tab_widgets": _collect_tab_widgets(ui),
-        },
+        "docks": _collect_docks(buckets),
+        "widgets": widgets,
     }
     return state
 
 
-def _apply_map_bool(ui: QWidget, mapping: dict[str, bool], klass: type[QWidget], report: RestoreReport, setter: str) -> None:
-    for name, val in mapping.items():
-        w = ui.findChild(klass, name)
-        if w is None:
-            report.missing += 1
-            report.missing_items.append(f"{klass.__name__}:{name}")
-            continue
-        fn = getattr(w, setter, None)
-        if callable(fn):
-            fn(bool(val))
-            report.restored += 1
-        else:
-            report.skipped += 1
-            report.skipped_items.append(f"{klass.__name__}:{name}:no_{setter}")
-
+def _widget_lookup(buckets: dict[type, list[tuple[str, QWidget]]]) -> dict[tuple[type, str], QWidget]:
+    """Flatten _index_widgets buckets into a {(klass, name): widget} map.
 
-def _apply_map_text(ui: QWidget, mapping: dict[str, str], klass: type[QWidget], report: RestoreReport, setter: str) -> None:
-    for name, val in mapping.items():
-        w = ui.findChild(klass, name)
-        if w is None:
-            report.missing += 1
-            report.missing_items.append(f"{klass.__name__}:{name}")
-            continue
-        fn = getattr(w, setter, None)
-        if callable(fn):
-            fn(str(val))
-            report.restored += 1
-        else:
-            report.skipped += 1
-            report.skipped_items.append(f"{klass.__name__}:{name}:no_{setter}")
+    apply_session_state used to call ui.findChild(klass, name) per saved
+    entry — a recursive walk each time; lookups here are O(1).
+    """
+    idx: dict[tuple[type, str], QWidget] = {}
+    for klass, entries in buckets.items():
+        for name, w in entries:
+            idx[(klass, name)] = w
+    return idx
 
 
-def _apply_map_numeric(ui: QWidget, mapping: dict[str, Any], klass: type[QWidget], report: RestoreReport) -> None:
-    for name, val in mapping.items():
-        w = ui.findChild(klass, name)
-        if w is None:
-            report.missing += 1
-            report.missing_items.append(f"{klass.__name__}:{name}")
-            continue
-        try:
-            w.setValue(val)
-            report.restored += 1
-        except Exception:
-            report.skipped += 1
-            report.skipped_items.append(f"{klass.__name__}:{name}:invalid_value")
-
-
-def _apply_combo_boxes(ui: QWidget, mapping: dict[str, dict[str, Any]], report: RestoreReport) -> None:
+def _apply_combo_boxes(idx: dict[tuple[type, str], QWidget], mapping: dict[str, dict[str, Any]], report: RestoreReport) -> None:
     for name, rec in mapping.items():
         if name in EXCLUDED_COMBO_BOXES:
             continue
-        w = ui.findChild(QComboBox, name)
+        w = idx.get((QComboBox, name))
         if w is None:
             report.missing += 1
             report.missing_items.append(f"QComboBox:{name}")
@@ -324,20 +351,20 @@ def _apply_combo_boxes(ui: QWidget, mapping: dict[str, dict[str, Any]], report:
             )
 
 
-def _apply_tab_widgets(ui: QWidget, mapping: dict[str, int], report: RestoreReport) -> None:
-    for name, idx in mapping.items():
-        w = ui.findChild(QTabWidget, name)
+def _apply_tab_widgets(idx: dict[tuple[type, str], QWidget], mapping: dict[str, int], report: RestoreReport) -> None:
+    for name, tab_idx in mapping.items():
+        w = idx.get((QTabWidget, name))
         if w is None:
             report.missing += 1
             report.missing_items.append(f"QTabWidget:{name}")
             continue
-        if 0 <= int(idx) < w.count():
-            w.setCurrentIndex(int(idx))
+        if 0 <= int(tab_idx) < w.count():
+            w.setCurrentIndex(int(tab_idx))
             report.restored += 1
         else:
             report.skipped += 1
             report.skipped_items.append(
-                f"QTabWidget:{name}:index_out_of_range(saved={idx},count={w.count()})"
+                f"QTabWidget:{name}:index_out_of_range(saved={tab_idx},count={w.count()})"
             )
 
 
@@ -370,11 +397,14 @@ def apply_session_state(ui: QMainWindow, state: dict[str, Any]) -> RestoreReport
             report.skipped += 1
             report.skipped_items.append("window:restoreState:exception")
 
+    idx = _widget_lookup(_index_widgets(ui))
+
     # 2) Fallback dock visibility/floating (robust when new/changed docks exist).
     docks = state.get("docks", {})
+    pending_show: list[tuple[str, QWidget, bool, bool]] = []
     for name, rec in docks.items():
-        d = ui.findChild(QDockWidget, name)
-        widget = d if d is not None else ui.findChild(QWidget, name)
+        d = idx.get((QDockWidget, name))
+        widget = d if d is not None else idx.get((QWidget, name))
         if widget is None:
             report.missing += 1
             report.missing_items.append(f"QWidget:{name}")
@@ -393,45 +423,53 @@ def apply_session_state(ui: QMainWindow, state: dict[str, Any]) -> RestoreReport
                 if not ok:
                     report.skipped_items.append(f"QWidget:{name}:restoreGeometry:false")
             if "visible" in rec:
-                vis = bool(rec["visible"])
-                widget.setVisible(vis)
-                if vis:
-                    widget.show()
-                    widget.raise_()
-                report.restored += 1
+                # Defer visibility until every dock's floating state and
+                # geometry are set, so each dock gets one show, not a
+                # show-per-pass with a layout cycle each.
+                pending_show.append(
+                    (name, widget, bool(rec["visible"]), bool(rec.get("floating", False)))
+                )
         except Exception:
             report.skipped += 1
             report.skipped_items.append(f"QWidget:{name}:setFloating/setVisible_exception")
 
-    # Final visibility enforcement for floating docks after all state operations.
-    for name, rec in docks.items():
-        if not bool(rec.get("visible", False)):
-            continue
-        d = ui.findChild(QDockWidget, name)
-        widget = d if d is not None else ui.findChild(QWidget, name)
-        if widget is None:
-            continue
+    for name, widget, vis, floating in pending_show:
         try:
-            widget.show()
-            if bool(rec.get("floating", False)):
+            widget.setVisible(vis)
+            if vis and floating:
                 widget.raise_()
+            report.restored += 1
         except Exception:
-            pass
+            report.skipped += 1
+            report.skipped_items.append(f"QWidget:{name}:setVisible_exception")
 
     # 3) Restore generic widget values.
     widgets = state.get("widgets", {})
-    _apply_map_text(ui, widgets.get("line_edits", {}), QLineEdit, report, "setText")
-    _apply_map_text(ui, widgets.get("plain_text_edits", {}), QPlainTextEdit, report, "setPlainText")
-    _apply_map_numeric(ui, widgets.get("spin_boxes", {}), QSpinBox, report)
-    _apply_map_numeric(ui, widgets.get("double_spin_boxes", {}), QDoubleSpinBox, report)
-    _apply_map_bool(ui, widgets.get("check_boxes", {}), QCheckBox, report, "setChecked")
-    _apply_map_bool(ui, widgets.get("radio_buttons", {}), QRadioButton, report, "setChecked")
-    _apply_combo_boxes(ui, widgets.get("combo_boxes", {}), report)
-    _apply_tab_widgets(ui, widgets.get("tab_widgets", {}), report)
+    _apply_values(idx, widgets, report)
+    _apply_combo_boxes(idx, widgets.get("combo_boxes", {}), report)
+    _apply_tab_widgets(idx, widgets.get("tab_widgets", {}), report)
 
     return report
 
 
+def _dumps_state(state: dict[str, Any]) -> bytes:
+    """Serialize a state dict to pretty-printed UTF-8 JSON bytes.
+
+    Uses orjson when available (C encoder, several times faster on
+    sessions with large sample_rows lists) and stdlib json otherwise;
+    both produce 2-space-indented files either can read back.
+    """
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    return json.dumps(state, indent=2, ensure_ascii=True).encode("utf-8")
+
+
+def _loads_state(raw: bytes | str) -> dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def save_session_file(
     path: str | Path,
     ui: QMainWindow,
@@ -444,14 +482,14 @@ def save_session_file(
         p = p.with_suffix(".lss")
 
     state = collect_session_state(ui, app_meta=app_meta, session_meta=session_meta)
-    p.write_text(json.dumps(state, indent=2, ensure_ascii=True), encoding="utf-8")
+    p.write_bytes(_dumps_state(state))
     return {"path": str(p), "state": state}
 
 
 def load_session_file(path: str | Path, ui: QMainWindow) -> dict[str, Any]:
     p = Path(path).expanduser()
-    raw = p.read_text(encoding="utf-8")
-    state = json.loads(raw)
+    raw = p.read_bytes()
+    state = _loads_state(raw)
 
     report = apply_session_state(ui, state)
     return {
@@ -479,7 +517,7 @@ def collect_geometry_state(
         "saved_utc": _now_utc(),
         "app": app_meta or {},
         "window": _collect_window(ui),
-        "docks": _collect_docks(ui),
+        "docks": _collect_docks(_index_widgets(ui)),
     }
 
 
@@ -500,14 +538,14 @@ def save_geometry_file(
 ) -> dict[str, Any]:
     p = Path(path).expanduser()
     state = collect_geometry_state(ui, app_meta=app_meta)
-    p.write_text(json.dumps(state, indent=2, ensure_ascii=True), encoding="utf-8")
+    p.write_bytes(_dumps_state(state))
     return {"path": str(p), "state": state}
 
 
 def load_geometry_file(path: str | Path, ui: QMainWindow) -> dict[str, Any]:
     p = Path(path).expanduser()
-    raw = p.read_text(encoding="utf-8")
-    state = json.loads(raw)
+    raw = p.read_bytes()
+    state = _loads_state(raw)
     report = apply_geometry_state(ui, state)
     return {
         "path": str(p),